@@ -1,6 +1,8 @@
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # 프로젝트 루트 경로 (app/core/config.py 기준으로 2단계 상위)
@@ -19,6 +21,81 @@ class Settings(BaseSettings):
     EMBEDDING_DIMENSION: int = 1536
     LOG_LEVEL: str = "INFO"
     DEBUG: bool = False  # True면 에러 상세 정보 노출
+    OPENAI_TIMEOUT: float = 10.0  # 초
+
+    # 서킷 브레이커 (OpenAI 장애 시 빠른 실패)
+    CIRCUIT_FAILURE_RATE_THRESHOLD: float = 0.5
+    CIRCUIT_MINIMUM_CALLS: int = 5
+    CIRCUIT_WINDOW_SECONDS: float = 30.0
+    CIRCUIT_OPEN_SECONDS: float = 15.0
+    CIRCUIT_HALF_OPEN_MAX_CALLS: int = 2
+
+    # 임베딩 캐시 / 장애 시 대체 백엔드 (OpenAI 호환 로컬 서버)
+    EMBEDDING_CACHE_SIZE: int = 10000
+    FALLBACK_EMBEDDING_BASE_URL: str | None = None  # 예: http://localhost:11434/v1
+    FALLBACK_EMBEDDING_MODEL: str | None = None
+    FALLBACK_EMBEDDING_API_KEY: str = "local"
+
+    # 우선순위 레인 (interactive: 단건 /embed, bulk: 배치/백필)
+    SCHEDULER_MAX_CONCURRENCY: int = 16  # 동시 OpenAI 호출 수
+    SCHEDULER_INTERACTIVE_RESERVED: int = 4  # interactive 전용 슬롯
+    SCHEDULER_INTERACTIVE_WEIGHT: int = 4
+    SCHEDULER_BULK_WEIGHT: int = 1
+    OPENAI_TOKENS_PER_MINUTE: int = 1_000_000
+    INTERACTIVE_TOKEN_SHARE: float = 0.3  # 분당 토큰 중 interactive 전용 비율
+    INTERACTIVE_BATCH_SIZE: int = 16
+    BULK_BATCH_SIZE: int = 256
+    BULK_API_KEYS: list[str] = []  # X-API-Key가 여기 있으면 bulk 레인 (JSON 배열)
+
+    # 워밍업 재시도 (DB/OpenAI가 복구될 때까지 지수 백오프, 초)
+    WARM_UP_RETRY_INITIAL_DELAY: float = 1.0
+    WARM_UP_RETRY_MAX_DELAY: float = 60.0
+
+    # 프로파일링 (opt-in). /admin/* 는 X-Admin-Key 헤더가 ADMIN_API_KEY와 같아야 호출 가능
+    PROFILING_ENABLED: bool = False
+    ADMIN_API_KEY: str | None = None
+    EVENT_LOOP_SLOW_THRESHOLD_MS: float = 100.0
+
+    # 임베딩 저장 (write-behind). 비어 있으면 저장은 Spring 서버가 담당
+    VECTOR_STORE_URL: str | None = None  # postgresql://... 또는 sqlite:///...
+    VECTOR_STORE_POOL_MIN_SIZE: int = 1
+    VECTOR_STORE_POOL_MAX_SIZE: int = 10
+    VECTOR_STORE_CONNECT_TIMEOUT: float = 10.0  # 연결/풀 대기 (초)
+    VECTOR_STORE_COMMAND_TIMEOUT: float = 30.0  # 쿼리 (초)
+    WRITE_BEHIND_BATCH_SIZE: int = 500
+    WRITE_BEHIND_FLUSH_INTERVAL: float = 1.0  # 초
+    WRITE_BEHIND_MAX_PENDING: int = 10000  # 넘으면 저장하지 않고 persisted: false로 응답
+
+    # 근접 중복 리포트 감지 (MinHash + LSH). flag: 응답에 표시만, reuse: 근접 중복의 임베딩 재사용
+    NEAR_DUPLICATE_MODE: Literal["off", "flag", "reuse"] = "off"
+    NEAR_DUPLICATE_THRESHOLD: float = 0.8  # 추정 Jaccard 유사도
+    NEAR_DUPLICATE_MAX_ENTRIES: int = 100000
+
+    # 클러스터 인덱스 (coarse-to-fine 검색, 주제별 탐색)
+    CLUSTER_INDEX_ENABLED: bool = False
+    CLUSTER_COUNT: int | None = None  # 비우면 코퍼스 크기로 결정 (rows/1000, 100만 초과 시 sqrt)
+    CLUSTER_NPROBE: int = 4  # 검색 시 탐색할 클러스터 수
+    CLUSTER_IMBALANCE_THRESHOLD: float = 3.0  # 최대 클러스터 / 평균 크기가 이 이상이면 재학습 권장
+
+    @model_validator(mode="after")
+    def check_fallback_model(self) -> "Settings":
+        # 대체 백엔드 벡터는 degraded로 표시되고 저장/인덱스에서 제외되는데, 모델명으로 구분하므로
+        # 비어 있으면 기본 모델명으로, 같으면 OpenAI 벡터와 같은 공간으로 잘못 취급됨
+        if self.FALLBACK_EMBEDDING_BASE_URL:
+            if not self.FALLBACK_EMBEDDING_MODEL:
+                raise ValueError("FALLBACK_EMBEDDING_BASE_URL을 설정하면 FALLBACK_EMBEDDING_MODEL도 필요합니다")
+            if self.FALLBACK_EMBEDDING_MODEL == self.EMBEDDING_MODEL:
+                raise ValueError("FALLBACK_EMBEDDING_MODEL은 EMBEDDING_MODEL과 달라야 합니다")
+        return self
+
+    @model_validator(mode="after")
+    def check_scheduler(self) -> "Settings":
+        # bulk 레인에 슬롯이나 토큰이 남지 않으면 bulk 요청이 영원히 대기
+        if not 0 <= self.SCHEDULER_INTERACTIVE_RESERVED < self.SCHEDULER_MAX_CONCURRENCY:
+            raise ValueError("SCHEDULER_INTERACTIVE_RESERVED는 0 이상 SCHEDULER_MAX_CONCURRENCY 미만이어야 합니다")
+        if not 0 <= self.INTERACTIVE_TOKEN_SHARE < 1:
+            raise ValueError("INTERACTIVE_TOKEN_SHARE는 0 이상 1 미만이어야 합니다")
+        return self
 
 
 @lru_cache
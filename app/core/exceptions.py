@@ -7,11 +7,28 @@ class ErrorCode(str, Enum):
     # 400 Bad Request
     EMPTY_TEXT = "EMPTY_TEXT"
     INVALID_REPORT_FORMAT = "INVALID_REPORT_FORMAT"
+    INVALID_PRIORITY = "INVALID_PRIORITY"
+    INVALID_SEARCH_QUERY = "INVALID_SEARCH_QUERY"
+
+    # 404 Not Found
+    CLUSTER_NOT_FOUND = "CLUSTER_NOT_FOUND"
+
+    # 403 Forbidden
+    ADMIN_FORBIDDEN = "ADMIN_FORBIDDEN"
+
+    # 409 Conflict
+    PROFILING_IN_PROGRESS = "PROFILING_IN_PROGRESS"
+    CLUSTER_RETRAIN_IN_PROGRESS = "CLUSTER_RETRAIN_IN_PROGRESS"
 
     # 500 Internal Server Error
     EMBEDDING_FAILED = "EMBEDDING_FAILED"
     OPENAI_API_ERROR = "OPENAI_API_ERROR"
 
+    # 503 Service Unavailable
+    SERVICE_NOT_READY = "SERVICE_NOT_READY"
+    CIRCUIT_OPEN = "CIRCUIT_OPEN"
+    CLUSTER_INDEX_UNAVAILABLE = "CLUSTER_INDEX_UNAVAILABLE"
+
     @property
     def message(self) -> str:
         return ERROR_MESSAGES.get(self, "알 수 없는 오류가 발생했습니다.")
@@ -20,8 +37,17 @@ class ErrorCode(str, Enum):
 ERROR_MESSAGES: dict[ErrorCode, str] = {
     ErrorCode.EMPTY_TEXT: "리포트에서 임베딩할 텍스트를 추출할 수 없습니다.",
     ErrorCode.INVALID_REPORT_FORMAT: "리포트 형식이 올바르지 않습니다.",
+    ErrorCode.INVALID_PRIORITY: "X-Priority 헤더는 interactive 또는 bulk여야 합니다.",
+    ErrorCode.INVALID_SEARCH_QUERY: "검색 요청에는 vector 또는 report 중 하나가 필요합니다.",
+    ErrorCode.CLUSTER_NOT_FOUND: "존재하지 않는 클러스터입니다.",
+    ErrorCode.ADMIN_FORBIDDEN: "관리자 API가 비활성화되어 있거나 관리자 키가 올바르지 않습니다.",
+    ErrorCode.PROFILING_IN_PROGRESS: "이미 프로파일링이 진행 중입니다.",
+    ErrorCode.CLUSTER_RETRAIN_IN_PROGRESS: "이미 클러스터 재학습이 진행 중입니다.",
     ErrorCode.EMBEDDING_FAILED: "임베딩 생성 중 오류가 발생했습니다.",
     ErrorCode.OPENAI_API_ERROR: "OpenAI API 호출 중 오류가 발생했습니다.",
+    ErrorCode.SERVICE_NOT_READY: "서버가 아직 요청을 처리할 준비가 되지 않았습니다.",
+    ErrorCode.CIRCUIT_OPEN: "OpenAI API 장애로 임베딩 요청을 일시적으로 처리할 수 없습니다.",
+    ErrorCode.CLUSTER_INDEX_UNAVAILABLE: "클러스터 인덱스가 비활성화되어 있거나 아직 준비되지 않았습니다.",
 }
 
 
@@ -47,8 +73,36 @@ class BadRequestException(AppException):
         super().__init__(error_code, status_code=400, detail=detail)
 
 
+class ForbiddenException(AppException):
+    """403 Forbidden"""
+
+    def __init__(self, error_code: ErrorCode, detail: str | None = None):
+        super().__init__(error_code, status_code=403, detail=detail)
+
+
+class NotFoundException(AppException):
+    """404 Not Found"""
+
+    def __init__(self, error_code: ErrorCode, detail: str | None = None):
+        super().__init__(error_code, status_code=404, detail=detail)
+
+
+class ConflictException(AppException):
+    """409 Conflict"""
+
+    def __init__(self, error_code: ErrorCode, detail: str | None = None):
+        super().__init__(error_code, status_code=409, detail=detail)
+
+
 class InternalServerException(AppException):
     """500 Internal Server Error"""
 
     def __init__(self, error_code: ErrorCode, detail: str | None = None):
         super().__init__(error_code, status_code=500, detail=detail)
+
+
+class ServiceUnavailableException(AppException):
+    """503 Service Unavailable"""
+
+    def __init__(self, error_code: ErrorCode, detail: str | None = None):
+        super().__init__(error_code, status_code=503, detail=detail)
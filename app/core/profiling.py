@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from types import FrameType
+
+logger = logging.getLogger(__name__)
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _collapse(frame: FrameType, thread_name: str) -> str:
+    """프레임 체인을 flamegraph collapsed 형식(루트;...;리프)으로 변환합니다."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+class SamplingProfiler:
+    """
+    sys._current_frames() 기반 샘플링 프로파일러
+
+    별도 스레드에서 interval마다 모든 스레드의 스택을 수집하고,
+    flamegraph.pl / speedscope에서 읽을 수 있는 collapsed stack 텍스트로 반환합니다.
+    추가 의존성이 없고, 프로파일링 중이 아닐 때는 비용이 없습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._lock.locked()
+
+    def profile(self, seconds: float, interval: float = 0.005) -> str:
+        """
+        seconds 동안 샘플링합니다. (블로킹이므로 asyncio.to_thread로 호출)
+
+        Returns:
+            "frame;frame;frame count" 줄 목록
+
+        Raises:
+            RuntimeError: 이미 프로파일링 중인 경우
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("이미 프로파일링 중입니다")
+
+        try:
+            return self._sample(seconds, interval)
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds: float, interval: float) -> str:
+        own_thread = threading.get_ident()
+        stacks: Counter[str] = Counter()
+        deadline = time.monotonic() + seconds
+
+        while time.monotonic() < deadline:
+            thread_names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                stacks[_collapse(frame, thread_names.get(thread_id, str(thread_id)))] += 1
+            time.sleep(interval)
+
+        return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+
+
+class EventLoopMonitor:
+    """
+    이벤트 루프 지연 측정 및 블로킹 감지
+
+    - 루프 안의 하트비트 태스크가 interval마다 깨어나 예정 시각과의 차이(lag)를 기록합니다.
+    - 감시 스레드는 하트비트가 slow_threshold 이상 멈추면 그 순간 루프 스레드의 스택을
+      경고 로그로 남깁니다. (JSON 직렬화, pydantic 검증 등 루프를 막는 코드 추적용)
+
+    lag이 낮은데 `/embed` 지연이 길면 업스트림(OpenAI) 대기, lag이 높으면 루프 블로킹입니다.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        slow_threshold: float = 0.1,
+        window: int = 600,
+    ):
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self._lags: deque[float] = deque(maxlen=window)
+        self._max_lag = 0.0
+        self._slow_callbacks = 0
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="event-loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._lags.append(lag)
+            self._max_lag = max(self._max_lag, lag)
+            self._last_beat = now
+
+    def _watch(self) -> None:
+        reported_beat = None
+        while not self._stopped.wait(self.slow_threshold / 2):
+            beat = self._last_beat
+            if time.monotonic() - beat < self.slow_threshold + self.interval or beat == reported_beat:
+                continue
+
+            # 같은 정지 구간은 한 번만 보고
+            reported_beat = beat
+            self._slow_callbacks += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame, limit=15)) if frame else ""
+            logger.warning(
+                f"이벤트 루프가 {self.slow_threshold * 1000:.0f}ms 이상 블로킹됨. 루프 스레드 스택:\n{stack}"
+            )
+
+    def stats(self) -> dict[str, float | int]:
+        lags = sorted(self._lags)
+        p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else 0.0
+        return {
+            "lag_ms_last": round(self._lags[-1] * 1000, 3) if self._lags else 0.0,
+            "lag_ms_avg": round(sum(lags) / len(lags) * 1000, 3) if lags else 0.0,
+            "lag_ms_p99": round(p99 * 1000, 3),
+            "lag_ms_max": round(self._max_lag * 1000, 3),
+            "slow_callbacks": self._slow_callbacks,
+        }
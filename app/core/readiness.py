@@ -0,0 +1,35 @@
+class Readiness:
+    """
+    준비 상태(readiness) 추적
+
+    liveness(`/health`)는 프로세스가 떠 있으면 즉시 healthy를 반환하고,
+    readiness(`/ready`)는 등록된 컴포넌트(클라이언트, 캐시, 인덱스)가
+    모두 워밍업을 마친 뒤에만 ready를 반환합니다.
+    """
+
+    def __init__(self):
+        self._components: dict[str, bool] = {}
+        # 워밍업 재시도 중인 컴포넌트의 마지막 오류
+        self._errors: dict[str, str] = {}
+
+    def register(self, name: str) -> None:
+        """워밍업이 필요한 컴포넌트를 등록합니다."""
+        self._components.setdefault(name, False)
+
+    def mark_ready(self, name: str) -> None:
+        self._components[name] = True
+        self._errors.pop(name, None)
+
+    def mark_failed(self, name: str, error: Exception) -> None:
+        """워밍업 시도가 실패했음을 기록합니다. (준비 상태는 그대로 False)"""
+        self._errors[name] = f"{type(error).__name__}: {error}"
+
+    @property
+    def is_ready(self) -> bool:
+        return bool(self._components) and all(self._components.values())
+
+    def snapshot(self) -> dict[str, bool]:
+        return dict(self._components)
+
+    def errors(self) -> dict[str, str]:
+        return dict(self._errors)
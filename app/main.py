@@ -1,49 +1,281 @@
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
 from contextlib import asynccontextmanager
-from typing import Any
+from typing import Any, Literal, TypeVar
 
-from fastapi import Depends, FastAPI, Request
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-
-from app.core.config import get_settings
-from openai import APIError, APIConnectionError, RateLimitError
+import numpy as np
+from fastapi import Depends, FastAPI, Query, Request
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
+from pydantic import BaseModel, Field
 
+from app.core.config import Settings, get_settings
 from app.core.exceptions import (
     AppException,
     BadRequestException,
+    ConflictException,
     ErrorCode,
+    ForbiddenException,
     InternalServerException,
+    NotFoundException,
+    ServiceUnavailableException,
 )
+from app.core.profiling import EventLoopMonitor, SamplingProfiler
+from app.core.readiness import Readiness
 from app.core.response import ErrorResponse
-from app.services.embedding_service import EmbeddingService
-from app.utils.text_processor import extract_embedding_text
-
-# 로그 설정
-settings = get_settings()
-logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.cluster_index import (
+    ClusterAssignment,
+    ClusterIndex,
+    assign_clusters,
+    suggested_num_clusters,
+    train_centroids,
+)
+from app.services.embedding_cache import EmbeddingCache
+from app.services.embedding_service import EmbeddingResult, EmbeddingService
+from app.services.near_duplicate import NearDuplicateIndex
+from app.services.priority_scheduler import Priority, PriorityScheduler
+from app.services.resilient_embedding_service import ResilientEmbeddingService
+from app.services.vector_store import (
+    EmbeddingRecord,
+    VectorStore,
+    WriteBehindBuffer,
+    create_vector_store,
 )
+from app.utils.text_processor import extract_embedding_text, extract_embedding_texts
+from app.utils.vector_codec import encode_base64
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+def configure_logging(settings: Settings) -> None:
+    """로그 설정 (임포트 시점이 아닌 서버 시작 시점에 호출)"""
+    logging.basicConfig(
+        level=getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
 
 # === Lifespan ===
 
 
+def create_embedding_service(settings: Settings, model: str | None = None) -> ResilientEmbeddingService:
+    """
+    서킷 브레이커, 캐시, 우선순위 스케줄러, (설정 시) 대체 백엔드/근접 중복 인덱스로 감싼 임베딩 서비스를 생성합니다.
+
+    Args:
+        model: 임베딩 모델 (비우면 EMBEDDING_MODEL, 저장소가 있으면 live 모델을 넘김)
+    """
+    fallback = None
+    if settings.FALLBACK_EMBEDDING_BASE_URL:
+        fallback = EmbeddingService(
+            model=settings.FALLBACK_EMBEDDING_MODEL,
+            base_url=settings.FALLBACK_EMBEDDING_BASE_URL,
+            api_key=settings.FALLBACK_EMBEDDING_API_KEY,
+        )
+
+    return ResilientEmbeddingService(
+        primary=EmbeddingService(model=model),
+        breaker=CircuitBreaker(
+            failure_rate_threshold=settings.CIRCUIT_FAILURE_RATE_THRESHOLD,
+            minimum_calls=settings.CIRCUIT_MINIMUM_CALLS,
+            window_seconds=settings.CIRCUIT_WINDOW_SECONDS,
+            open_seconds=settings.CIRCUIT_OPEN_SECONDS,
+            half_open_max_calls=settings.CIRCUIT_HALF_OPEN_MAX_CALLS,
+        ),
+        cache=EmbeddingCache(max_entries=settings.EMBEDDING_CACHE_SIZE),
+        fallback=fallback,
+        near_duplicates=(
+            NearDuplicateIndex(
+                threshold=settings.NEAR_DUPLICATE_THRESHOLD,
+                max_entries=settings.NEAR_DUPLICATE_MAX_ENTRIES,
+            )
+            if settings.NEAR_DUPLICATE_MODE != "off"
+            else None
+        ),
+        reuse_near_duplicates=settings.NEAR_DUPLICATE_MODE == "reuse",
+        scheduler=PriorityScheduler(
+            max_concurrency=settings.SCHEDULER_MAX_CONCURRENCY,
+            interactive_reserved=settings.SCHEDULER_INTERACTIVE_RESERVED,
+            interactive_weight=settings.SCHEDULER_INTERACTIVE_WEIGHT,
+            bulk_weight=settings.SCHEDULER_BULK_WEIGHT,
+            tokens_per_minute=settings.OPENAI_TOKENS_PER_MINUTE,
+            interactive_token_share=settings.INTERACTIVE_TOKEN_SHARE,
+            interactive_batch_size=settings.INTERACTIVE_BATCH_SIZE,
+            bulk_batch_size=settings.BULK_BATCH_SIZE,
+        ),
+    )
+
+
+async def load_cluster_index(
+    settings: Settings,
+    service: ResilientEmbeddingService,
+    write_behind: WriteBehindBuffer | None,
+) -> ClusterIndex:
+    """저장된 벡터로 클러스터를 학습합니다. (저장소가 없으면 빈 인덱스에서 시작)"""
+    index = ClusterIndex(
+        dimension=service.dimension,
+        imbalance_threshold=settings.CLUSTER_IMBALANCE_THRESHOLD,
+    )
+    if write_behind is None:
+        return index
+
+    # 건수만큼 배열을 미리 잡고 배치를 바로 채워 넣어 코퍼스 사본을 만들지 않음
+    store = write_behind.store
+    index.reserve(await store.count(service.model))
+    async for ids, vectors in store.iter_embeddings(service.model):
+        index.extend(ids, vectors)
+    if len(index):
+        # 학습은 CPU 작업이므로 이벤트 루프 밖에서 수행
+        await asyncio.to_thread(index.train, settings.CLUSTER_COUNT)
+    return index
+
+
+async def open_vector_store(settings: Settings) -> tuple[VectorStore, str]:
+    """저장소를 열고 임베딩할 모델(live 모델, 없으면 EMBEDDING_MODEL 등록)을 정합니다."""
+    model = settings.EMBEDDING_MODEL
+    store = create_vector_store(
+        settings.VECTOR_STORE_URL,
+        pool_min_size=settings.VECTOR_STORE_POOL_MIN_SIZE,
+        pool_max_size=settings.VECTOR_STORE_POOL_MAX_SIZE,
+        connect_timeout=settings.VECTOR_STORE_CONNECT_TIMEOUT,
+        command_timeout=settings.VECTOR_STORE_COMMAND_TIMEOUT,
+    )
+    try:
+        await store.open()
+        # 마이그레이션으로 live 모델이 바뀌었으면 그 모델로 임베딩해야 검색 대상과 같은 벡터 공간이 됨
+        live = await store.live_model()
+        if live is None:
+            await store.register_model(model, settings.EMBEDDING_DIMENSION)
+            await store.activate_model(model)
+        elif live != model:
+            logger.warning(f"EMBEDDING_MODEL({model}) 대신 live 모델({live})로 임베딩합니다")
+            model = live
+    except BaseException:
+        # 재시도 때 새로 열므로 이번 풀/연결은 닫음
+        await store.close()
+        raise
+    return store, model
+
+
+async def retry_warm_up_step(
+    settings: Settings,
+    readiness: Readiness,
+    name: str,
+    step: Callable[[], Awaitable[T]],
+) -> T:
+    """
+    워밍업 단계를 성공할 때까지 지수 백오프로 재시도합니다.
+
+    DB/OpenAI가 잠깐 내려가 있어도 복구되면 ready가 되고,
+    그동안 마지막 오류는 `/ready`의 errors에 표시됩니다.
+    """
+    delay = settings.WARM_UP_RETRY_INITIAL_DELAY
+    attempt = 1
+    while True:
+        try:
+            return await step()
+        except Exception as e:
+            readiness.mark_failed(name, e)
+            logger.exception(f"워밍업 실패 ({name}, {attempt}회), {delay:.0f}초 후 재시도")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, settings.WARM_UP_RETRY_MAX_DELAY)
+        attempt += 1
+
+
+async def warm_up(app: FastAPI) -> None:
+    """클라이언트/캐시/인덱스를 백그라운드에서 준비하고 readiness를 갱신합니다."""
+    readiness: Readiness = app.state.readiness
+    settings = get_settings()
+
+    store = None
+    model = settings.EMBEDDING_MODEL
+    if settings.VECTOR_STORE_URL:
+        store, model = await retry_warm_up_step(
+            settings, readiness, "vector_store", lambda: open_vector_store(settings)
+        )
+
+    async def start_embedding_service() -> ResilientEmbeddingService:
+        service = create_embedding_service(settings, model=model)
+        # openai 임포트와 클라이언트 생성은 블로킹이므로 이벤트 루프 밖에서 수행
+        await asyncio.to_thread(service.primary.warm_up)
+        if service.fallback is not None:
+            await asyncio.to_thread(service.fallback.warm_up)
+        return service
+
+    service = await retry_warm_up_step(
+        settings, readiness, "embedding_service", start_embedding_service
+    )
+    app.state.embedding_service = service
+    readiness.mark_ready("embedding_service")
+
+    if store is not None:
+        write_behind = WriteBehindBuffer(
+            store,
+            batch_size=settings.WRITE_BEHIND_BATCH_SIZE,
+            flush_interval=settings.WRITE_BEHIND_FLUSH_INTERVAL,
+            max_pending=settings.WRITE_BEHIND_MAX_PENDING,
+        )
+        write_behind.start()
+        app.state.write_behind = write_behind
+        readiness.mark_ready("vector_store")
+
+    if settings.CLUSTER_INDEX_ENABLED:
+        app.state.cluster_index = await retry_warm_up_step(
+            settings,
+            readiness,
+            "cluster_index",
+            lambda: load_cluster_index(settings, service, app.state.write_behind),
+        )
+        readiness.mark_ready("cluster_index")
+
+    logger.info("서버 준비 완료")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """애플리케이션 생명주기 관리"""
     # Startup
+    settings = get_settings()
+    configure_logging(settings)
     logger.info("서버 시작 중...")
-    app.state.embedding_service = EmbeddingService()
     logger.info(f"임베딩 모델: {settings.EMBEDDING_MODEL}")
     logger.info(f"로그 레벨: {settings.LOG_LEVEL}")
 
+    app.state.embedding_service = None
+    app.state.readiness = Readiness()
+    app.state.readiness.register("embedding_service")
+    app.state.write_behind = None
+    if settings.VECTOR_STORE_URL:
+        app.state.readiness.register("vector_store")
+    app.state.cluster_index = None
+    app.state.cluster_retrain_lock = asyncio.Lock()
+    if settings.CLUSTER_INDEX_ENABLED:
+        app.state.readiness.register("cluster_index")
+    warm_up_task = asyncio.create_task(warm_up(app))
+
+    app.state.profiler = None
+    app.state.event_loop_monitor = None
+    if settings.PROFILING_ENABLED:
+        app.state.profiler = SamplingProfiler()
+        app.state.event_loop_monitor = EventLoopMonitor(
+            slow_threshold=settings.EVENT_LOOP_SLOW_THRESHOLD_MS / 1000
+        )
+        app.state.event_loop_monitor.start()
+        logger.info("프로파일링 활성화")
+
     yield
 
     # Shutdown
     logger.info("서버 종료 중...")
+    warm_up_task.cancel()
+    if app.state.event_loop_monitor is not None:
+        await app.state.event_loop_monitor.stop()
+    if app.state.write_behind is not None:
+        # 버퍼에 남은 임베딩을 모두 기록한 뒤 종료
+        await app.state.write_behind.close()
 
 
 app = FastAPI(title="DeVine AI Server", version="1.0.0", lifespan=lifespan)
@@ -52,9 +284,64 @@ app = FastAPI(title="DeVine AI Server", version="1.0.0", lifespan=lifespan)
 # === Dependencies ===
 
 
-def get_embedding_service(request: Request) -> EmbeddingService:
+def get_write_behind(request: Request) -> WriteBehindBuffer | None:
+    """WriteBehindBuffer 의존성 주입 (VECTOR_STORE_URL 미설정 시 None)"""
+    return request.app.state.write_behind
+
+
+def resolve_priority(request: Request, default: Priority) -> Priority:
+    """
+    요청 우선순위 결정
+
+    1. X-API-Key가 BULK_API_KEYS에 있으면 bulk (헤더로 올릴 수 없음)
+    2. X-Priority: bulk면 bulk (interactive 헤더는 무시, 엔드포인트 기본값보다 올릴 수 없음)
+    3. 엔드포인트 기본값
+    """
+    header = request.headers.get("X-Priority")
+    if header:
+        try:
+            requested = Priority(header.lower())
+        except ValueError:
+            raise BadRequestException(ErrorCode.INVALID_PRIORITY, detail=header)
+        if requested == Priority.BULK:
+            return Priority.BULK
+    if request.headers.get("X-API-Key") in get_settings().BULK_API_KEYS:
+        return Priority.BULK
+    return default
+
+
+def require_admin(request: Request) -> None:
+    """관리자 API 인증 (ADMIN_API_KEY 설정 시에만 허용)"""
+    settings = get_settings()
+    if not settings.ADMIN_API_KEY or request.headers.get("X-Admin-Key") != settings.ADMIN_API_KEY:
+        raise ForbiddenException(ErrorCode.ADMIN_FORBIDDEN)
+
+
+def require_profiling(request: Request) -> None:
+    """프로파일링 API는 PROFILING_ENABLED일 때만 허용"""
+    if request.app.state.profiler is None:
+        raise ForbiddenException(ErrorCode.ADMIN_FORBIDDEN, detail="PROFILING_ENABLED=false")
+
+
+def get_cluster_index(request: Request) -> ClusterIndex:
+    """ClusterIndex 의존성 주입 (CLUSTER_INDEX_ENABLED이고 로드 완료 시)"""
+    index = request.app.state.cluster_index
+    if index is None:
+        raise ServiceUnavailableException(ErrorCode.CLUSTER_INDEX_UNAVAILABLE)
+    return index
+
+
+def get_optional_cluster_index(request: Request) -> ClusterIndex | None:
+    """/embed에서 새 벡터를 인덱스에 반영할 때 사용 (미사용 시 None)"""
+    return request.app.state.cluster_index
+
+
+def get_embedding_service(request: Request) -> ResilientEmbeddingService:
     """EmbeddingService 의존성 주입"""
-    return request.app.state.embedding_service
+    service = request.app.state.embedding_service
+    if service is None:
+        raise ServiceUnavailableException(ErrorCode.SERVICE_NOT_READY)
+    return service
 
 
 # === Request/Response Models ===
@@ -62,11 +349,59 @@ def get_embedding_service(request: Request) -> EmbeddingService:
 
 class EmbeddingRequest(BaseModel):
     report: dict[str, Any]
+    # 지정하면 서버가 report_embeddings에 직접 저장 (VECTOR_STORE_URL 설정 시)
+    report_id: int | None = None
+    # report_embeddings.report_title VARCHAR(500): 초과하면 저장 배치 전체가 실패하므로 요청 단계에서 거부
+    report_title: str | None = Field(None, max_length=500)
+
+
+class NearDuplicateInfo(BaseModel):
+    text_digest: str  # 근접 중복 텍스트의 다이제스트
+    similarity: float  # 추정 Jaccard 유사도
+    # True면 해당 텍스트의 임베딩을 재사용 (OpenAI 호출 생략, 응답 text_digest도 해당 텍스트의 것)
+    reused: bool
+    report_id: int | None = None  # 근접 중복 그룹의 대표 리포트 (알려진 경우)
+
+
+# float: JSON 숫자 배열 (기존 클라이언트), base64: little-endian float32 바이트 (OpenAI와 같은 형식)
+VectorEncoding = Literal["float", "base64"]
 
 
 class EmbeddingResponse(BaseModel):
-    vector: list[float]
+    vector: list[float] | str  # encoding_format=base64면 base64 문자열
     dimension: int
+    model: str
+    text_digest: str  # 입력 텍스트 SHA-256 (같은 모델에서 재임베딩 생략 판단용)
+    persisted: bool = False  # True면 저장 대기열에 등록됨 (Spring 저장 불필요)
+    degraded: bool = False  # True면 OpenAI 장애로 캐시/대체 백엔드에서 응답
+    near_duplicate: NearDuplicateInfo | None = None  # NEAR_DUPLICATE_MODE가 off가 아닐 때
+
+
+class EmbeddingBatchRequest(BaseModel):
+    items: list[EmbeddingRequest]
+
+
+class EmbeddingBatchResponse(BaseModel):
+    results: list[EmbeddingResponse]
+
+
+class SearchRequest(BaseModel):
+    # vector 또는 report 중 하나 (report면 임베딩 후 검색)
+    vector: list[float] | None = None
+    report: dict[str, Any] | None = None
+    limit: int = Field(10, ge=1, le=100)
+    nprobe: int | None = Field(None, ge=1)  # 비우면 CLUSTER_NPROBE
+
+
+class SearchResult(BaseModel):
+    report_id: int
+    similarity: float
+    cluster_id: int | None
+    duplicates: list[int] = []  # 인덱스에서 제외된 근접 중복 리포트
+
+
+class SearchResponse(BaseModel):
+    results: list[SearchResult]
 
 
 # === Exception Handlers ===
@@ -78,7 +413,7 @@ async def app_exception_handler(request: Request, exc: AppException):
     logger.error(f"[{exc.error_code}] {exc.detail}")
 
     # DEBUG 모드가 아니면 상세 정보 숨김
-    show_detail = settings.DEBUG and exc.detail != exc.error_code.message
+    show_detail = get_settings().DEBUG and exc.detail != exc.error_code.message
 
     return JSONResponse(
         status_code=exc.status_code,
@@ -99,7 +434,7 @@ async def global_exception_handler(request: Request, exc: Exception):
         content=ErrorResponse(
             error_code="INTERNAL_ERROR",
             message="서버 내부 오류가 발생했습니다.",
-            detail=str(exc) if settings.DEBUG else None,
+            detail=str(exc) if get_settings().DEBUG else None,
         ).model_dump(),
     )
 
@@ -113,17 +448,143 @@ async def health_check():
     return {"status": "healthy", "service": "DeVine AI Server"}
 
 
+@app.get("/ready")
+async def readiness_check(request: Request):
+    """트래픽 수신 가능 여부 (클라이언트, 캐시, 인덱스 워밍업 완료 시 ready)"""
+    readiness: Readiness = request.app.state.readiness
+    return JSONResponse(
+        status_code=200 if readiness.is_ready else 503,
+        content={
+            "status": "ready" if readiness.is_ready else "starting",
+            "components": readiness.snapshot(),
+            "errors": readiness.errors(),
+        },
+    )
+
+
+async def create_embeddings(
+    embedding_service: ResilientEmbeddingService,
+    texts: list[str],
+    priority: Priority,
+) -> list[EmbeddingResult]:
+    """임베딩 서비스 호출 + 예외를 에러 코드로 변환"""
+    try:
+        return await embedding_service.embed_many(texts, priority)
+    except AppException:
+        raise
+    except Exception as e:
+        if embedding_service.is_upstream_error(e):
+            logger.error(f"OpenAI API 오류: {e}")
+            raise InternalServerException(
+                ErrorCode.OPENAI_API_ERROR,
+                detail=str(e),
+            )
+        logger.error(f"임베딩 생성 실패: {e}")
+        raise InternalServerException(
+            ErrorCode.EMBEDDING_FAILED,
+            detail=str(e),
+        )
+
+
+async def to_response(
+    request: EmbeddingRequest,
+    result: EmbeddingResult,
+    embedding_service: ResilientEmbeddingService,
+    write_behind: WriteBehindBuffer | None,
+    cluster_index: ClusterIndex | None = None,
+    encoding_format: VectorEncoding = "float",
+) -> dict[str, Any]:
+    """
+    (설정 시) 저장 대기열과 클러스터 인덱스에 등록하고 EmbeddingResponse 형태의 dict로 변환
+
+    벡터는 float32 배열 그대로 넘기고 ORJSONResponse가 버퍼에서 바로 JSON 숫자 배열을 씁니다.
+    (pydantic 모델을 거치면 원소마다 Python float 목록이 만들어짐)
+    """
+    if result.degraded:
+        logger.warning(f"degraded 응답 (model: {result.model})")
+
+    near_duplicate = None
+    if result.near_duplicate is not None:
+        near_duplicate = NearDuplicateInfo(
+            text_digest=result.near_duplicate.key,
+            similarity=result.near_duplicate.similarity,
+            reused=result.near_duplicate.reused,
+            report_id=embedding_service.near_duplicates.report_for(result.near_duplicate.key),
+        )
+
+    canonical_report = request.report_id
+    if (
+        embedding_service.near_duplicates is not None
+        and request.report_id is not None
+        and result.model == embedding_service.model
+    ):
+        link = embedding_service.near_duplicates.link_report(result.text_digest, request.report_id)
+        canonical_report = link.canonical
+        if link.promoted is not None and cluster_index is not None:
+            # 대표였던 리포트가 그룹을 떠나 인덱스에서 빠져 있던 리포트가 새 대표가 됨
+            vector = embedding_service.cache.get(embedding_service.model, link.promoted_key)
+            if vector is not None:
+                cluster_index.add(link.promoted, vector)
+            else:
+                logger.warning(
+                    f"새 대표 리포트의 벡터가 캐시에 없어 재학습/재시작 때 반영됩니다 (report_id: {link.promoted})"
+                )
+
+    persisted = False
+    # 대체 백엔드 벡터는 다른 벡터 공간이므로 저장하지 않음
+    if (
+        write_behind is not None
+        and request.report_id is not None
+        and result.model == embedding_service.model
+    ):
+        # 저장소 장애로 대기열이 가득 차면 persisted: false로 응답해 Spring이 저장
+        persisted = await write_behind.enqueue(
+            EmbeddingRecord(
+                report_id=request.report_id,
+                embedding=result.vector,
+                model=result.model,
+                text_digest=result.text_digest,
+                report_title=request.report_title,
+            )
+        )
+
+    # 근접 중복 리포트는 대표 리포트만 검색 인덱스에 둠 (대표였다가 중복이 되면 이전 벡터 제거)
+    if (
+        cluster_index is not None
+        and request.report_id is not None
+        and result.model == embedding_service.model
+    ):
+        if canonical_report == request.report_id:
+            cluster_index.add(request.report_id, result.vector)
+        else:
+            cluster_index.remove(request.report_id)
+
+    return {
+        "vector": encode_base64(result.vector) if encoding_format == "base64" else result.vector,
+        "dimension": result.dimension,
+        "model": result.model,
+        "text_digest": result.text_digest,
+        "persisted": persisted,
+        "degraded": result.degraded,
+        "near_duplicate": near_duplicate.model_dump() if near_duplicate else None,
+    }
+
+
 @app.post("/embed", response_model=EmbeddingResponse)
 async def embed_report(
     request: EmbeddingRequest,
-    embedding_service: EmbeddingService = Depends(get_embedding_service),
+    http_request: Request,
+    embedding_service: ResilientEmbeddingService = Depends(get_embedding_service),
+    write_behind: WriteBehindBuffer | None = Depends(get_write_behind),
+    cluster_index: ClusterIndex | None = Depends(get_optional_cluster_index),
+    encoding_format: VectorEncoding = Query("float"),
 ):
     """
     리포트 JSON을 받아 임베딩 벡터를 반환합니다.
 
     - 리포트에서 핵심 텍스트 추출 (summary, mainTech, techStack, 구현 제목)
     - OpenAI text-embedding-3-small 모델로 임베딩
-    - 1536 차원 벡터 반환
+    - 1536 차원 벡터 반환 (`encoding_format=base64`면 float32 바이트의 base64)
     """
     logger.info("임베딩 요청 수신")
     logger.debug(f"리포트 키: {list(request.report.keys())}")
@@ -135,24 +596,224 @@ async def embed_report(
 
     logger.debug(f"추출된 텍스트 길이: {len(text)}자")
 
-    try:
-        vector = await embedding_service.create_embedding(text)
-    except (RateLimitError, APIConnectionError, APIError) as e:
-        logger.error(f"OpenAI API 오류: {e}")
-        raise InternalServerException(
-            ErrorCode.OPENAI_API_ERROR,
-            detail=str(e),
+    priority = resolve_priority(http_request, default=Priority.INTERACTIVE)
+    [result] = await create_embeddings(embedding_service, [text], priority)
+
+    logger.info(f"임베딩 생성 완료 (dimension: {result.dimension})")
+
+    return ORJSONResponse(
+        await to_response(
+            request, result, embedding_service, write_behind, cluster_index, encoding_format
         )
-    except Exception as e:
-        logger.error(f"임베딩 생성 실패: {e}")
-        raise InternalServerException(
-            ErrorCode.EMBEDDING_FAILED,
-            detail=str(e),
+    )
+
+
+@app.post("/embed/batch", response_model=EmbeddingBatchResponse)
+async def embed_reports(
+    request: EmbeddingBatchRequest,
+    http_request: Request,
+    embedding_service: ResilientEmbeddingService = Depends(get_embedding_service),
+    write_behind: WriteBehindBuffer | None = Depends(get_write_behind),
+    cluster_index: ClusterIndex | None = Depends(get_optional_cluster_index),
+    encoding_format: VectorEncoding = Query("float"),
+):
+    """
+    리포트 여러 개를 임베딩합니다. (백필/배치 스크립트용, 기본 bulk 레인)
+
+    레인별 배치 크기(INTERACTIVE_BATCH_SIZE, BULK_BATCH_SIZE)로 나눠 OpenAI를 호출합니다.
+    """
+    logger.info(f"배치 임베딩 요청 수신 ({len(request.items)}건)")
+
+    texts = [text for text, _ in extract_embedding_texts(item.report for item in request.items)]
+    for index, text in enumerate(texts):
+        if not text.strip():
+            raise BadRequestException(ErrorCode.EMPTY_TEXT, detail=f"items[{index}]")
+
+    priority = resolve_priority(http_request, default=Priority.BULK)
+    scheduler = embedding_service.scheduler
+    batch_size = scheduler.batch_size(priority) if scheduler else max(len(texts), 1)
+
+    chunks = await asyncio.gather(
+        *(
+            create_embeddings(embedding_service, texts[i : i + batch_size], priority)
+            for i in range(0, len(texts), batch_size)
         )
+    )
+    results = [result for chunk in chunks for result in chunk]
+
+    logger.info(f"배치 임베딩 생성 완료 ({len(results)}건, priority: {priority.value})")
+
+    return ORJSONResponse(
+        {
+            "results": [
+                await to_response(
+                    item, result, embedding_service, write_behind, cluster_index, encoding_format
+                )
+                for item, result in zip(request.items, results)
+            ]
+        }
+    )
 
-    logger.info(f"임베딩 생성 완료 (dimension: {len(vector)})")
 
-    return EmbeddingResponse(
-        vector=vector,
-        dimension=len(vector),
+@app.post("/search", response_model=SearchResponse)
+async def search(
+    request: SearchRequest,
+    http_request: Request,
+    cluster_index: ClusterIndex = Depends(get_cluster_index),
+):
+    """
+    클러스터 기반 coarse-to-fine 유사 리포트 검색
+
+    가장 가까운 nprobe개 클러스터의 멤버만 정확한 코사인 유사도로 비교합니다.
+    """
+    if (request.vector is None) == (request.report is None):
+        raise BadRequestException(ErrorCode.INVALID_SEARCH_QUERY)
+
+    if request.vector is not None:
+        if len(request.vector) != cluster_index.dimension:
+            raise BadRequestException(
+                ErrorCode.INVALID_SEARCH_QUERY,
+                detail=f"vector 차원 {len(request.vector)} != {cluster_index.dimension}",
+            )
+        query = request.vector
+    else:
+        embedding_service = get_embedding_service(http_request)
+        text = extract_embedding_text(request.report)
+        if not text.strip():
+            raise BadRequestException(ErrorCode.EMPTY_TEXT)
+        priority = resolve_priority(http_request, default=Priority.INTERACTIVE)
+        [result] = await create_embeddings(embedding_service, [text], priority)
+        # 대체 백엔드 벡터는 인덱스와 다른 벡터 공간
+        if result.model != embedding_service.model:
+            raise ServiceUnavailableException(ErrorCode.CIRCUIT_OPEN, detail=result.model)
+        query = result.vector
+
+    nprobe = request.nprobe or get_settings().CLUSTER_NPROBE
+    service: ResilientEmbeddingService | None = http_request.app.state.embedding_service
+    near_duplicates = service.near_duplicates if service is not None else None
+    return SearchResponse(
+        results=[
+            SearchResult(
+                report_id=report_id,
+                similarity=similarity,
+                cluster_id=cluster_index.cluster_of(report_id),
+                duplicates=near_duplicates.duplicates_of(report_id) if near_duplicates else [],
+            )
+            for report_id, similarity in cluster_index.search(query, request.limit, nprobe)
+        ]
     )
+
+
+@app.get("/clusters")
+async def cluster_overview(cluster_index: ClusterIndex = Depends(get_cluster_index)):
+    """클러스터 크기 분포와 재학습 필요 여부 (IVFFlat lists 권장값 포함)"""
+    balance = cluster_index.balance()
+    return {
+        "num_vectors": len(cluster_index),
+        "num_clusters": cluster_index.num_clusters,
+        "sizes": balance.sizes,
+        "max_ratio": balance.max_ratio,
+        "coefficient_of_variation": balance.coefficient_of_variation,
+        "needs_retraining": balance.needs_retraining,
+        "suggested_num_clusters": suggested_num_clusters(len(cluster_index)),
+    }
+
+
+@app.get("/clusters/{cluster_id}")
+async def cluster_members(
+    cluster_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cluster_index: ClusterIndex = Depends(get_cluster_index),
+):
+    """같은 클러스터(주제)에 속한 리포트 목록"""
+    if not 0 <= cluster_id < cluster_index.num_clusters:
+        raise NotFoundException(ErrorCode.CLUSTER_NOT_FOUND, detail=str(cluster_id))
+
+    members = cluster_index.members(cluster_id)
+    return {
+        "cluster_id": cluster_id,
+        "size": len(members),
+        "report_ids": members[offset : offset + limit],
+    }
+
+
+# === Admin Endpoints ===
+
+
+@app.get(
+    "/admin/profile",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_admin), Depends(require_profiling)],
+)
+async def profile(
+    request: Request,
+    seconds: float = Query(10.0, gt=0, le=60),
+    interval_ms: float = Query(5.0, ge=1, le=100),
+):
+    """
+    N초 동안 샘플링한 스택을 flamegraph collapsed 형식으로 반환합니다.
+
+    `flamegraph.pl` 또는 speedscope에 그대로 넣어 시각화할 수 있습니다.
+    """
+    profiler: SamplingProfiler = request.app.state.profiler
+    if profiler.is_running:
+        raise ConflictException(ErrorCode.PROFILING_IN_PROGRESS)
+
+    logger.info(f"프로파일링 시작 ({seconds}초)")
+    # 샘플러는 별도 스레드에서 돌고, 이벤트 루프는 계속 요청을 처리
+    try:
+        return await asyncio.to_thread(profiler.profile, seconds, interval_ms / 1000)
+    except RuntimeError:
+        raise ConflictException(ErrorCode.PROFILING_IN_PROGRESS)
+
+
+@app.get("/admin/event-loop", dependencies=[Depends(require_admin), Depends(require_profiling)])
+async def event_loop_stats(request: Request):
+    """이벤트 루프 지연과 블로킹(slow callback) 횟수, 레인별 대기 현황을 반환합니다."""
+    monitor: EventLoopMonitor = request.app.state.event_loop_monitor
+    service: ResilientEmbeddingService | None = request.app.state.embedding_service
+    return {
+        "event_loop": monitor.stats(),
+        "scheduler": service.scheduler.stats() if service and service.scheduler else None,
+    }
+
+
+def _retrain_clusters(vectors: np.ndarray, num_clusters: int) -> ClusterAssignment:
+    """스레드에서 실행: 중심점 학습 + 전체 벡터 배정"""
+    return assign_clusters(vectors, train_centroids(vectors, num_clusters))
+
+
+@app.post("/admin/clusters/retrain", dependencies=[Depends(require_admin)])
+async def retrain_clusters(
+    request: Request,
+    num_clusters: int | None = Query(None, ge=1),
+    cluster_index: ClusterIndex = Depends(get_cluster_index),
+):
+    """
+    현재 인덱스의 벡터로 중심점을 다시 학습합니다.
+
+    학습과 전체 벡터 배정은 스냅샷으로 별도 스레드에서 수행하므로 그동안에도 검색/추가가 가능하고,
+    끝나면 이벤트 루프에서 중심점과 배정을 한 번에 교체합니다.
+    """
+    lock: asyncio.Lock = request.app.state.cluster_retrain_lock
+    if lock.locked():
+        raise ConflictException(ErrorCode.CLUSTER_RETRAIN_IN_PROGRESS)
+    if len(cluster_index) == 0:
+        return {"num_vectors": 0, "num_clusters": cluster_index.num_clusters}
+
+    async with lock:
+        num_clusters = (
+            num_clusters or get_settings().CLUSTER_COUNT or suggested_num_clusters(len(cluster_index))
+        )
+        logger.info(f"클러스터 재학습 시작 (clusters: {num_clusters})")
+        vectors = cluster_index.begin_retrain()
+        try:
+            assignment = await asyncio.to_thread(_retrain_clusters, vectors, num_clusters)
+        except BaseException:
+            cluster_index.abort_retrain()
+            raise
+        # 학습 중 추가/갱신된 벡터만 다시 배정하고 한 번에 교체
+        cluster_index.swap(assignment)
+
+    return {"num_vectors": len(cluster_index), "num_clusters": cluster_index.num_clusters}
@@ -0,0 +1,113 @@
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from enum import Enum
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"  # 정상: 모든 요청 통과
+    OPEN = "open"  # 차단: 요청을 보내지 않고 즉시 실패
+    HALF_OPEN = "half_open"  # 시험: 제한된 수의 요청만 통과시켜 복구 여부 확인
+
+
+class CircuitBreaker:
+    """
+    실패율 기반 서킷 브레이커
+
+    최근 window_seconds 동안 호출이 minimum_calls 이상이고 실패율이
+    failure_rate_threshold 이상이면 OPEN으로 전환해 open_seconds 동안 호출을 막습니다.
+    이후 HALF_OPEN에서 half_open_max_calls개의 시험 호출이 모두 성공하면 CLOSED로,
+    하나라도 실패하면 다시 OPEN으로 돌아갑니다.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 5,
+        window_seconds: float = 30.0,
+        open_seconds: float = 15.0,
+        half_open_max_calls: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        self._state = CircuitState.CLOSED
+        self._outcomes: deque[tuple[float, bool]] = deque()  # (시각, 성공 여부)
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self._trial_successes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.open_seconds
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def allow_request(self) -> bool:
+        """이번 호출을 업스트림으로 보내도 되는지 반환합니다."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and self._trial_calls < self.half_open_max_calls:
+            self._trial_calls += 1
+            return True
+        return False
+
+    def release(self) -> None:
+        """
+        허용된 호출이 성공/실패 판정 없이 끝났을 때 호출합니다. (취소, 업스트림과 무관한 오류)
+
+        HALF_OPEN 시험 슬롯을 반납하지 않으면 슬롯이 모두 소진된 채 OPEN/CLOSED 어느 쪽으로도
+        전환되지 않아 서킷이 HALF_OPEN에 머물게 됩니다.
+        """
+        if self._state == CircuitState.HALF_OPEN and self._trial_calls > 0:
+            self._trial_calls -= 1
+
+    def record_success(self) -> None:
+        if self._state == CircuitState.HALF_OPEN:
+            self._trial_successes += 1
+            if self._trial_successes >= self.half_open_max_calls:
+                self._transition(CircuitState.CLOSED)
+            return
+        self._record(True)
+
+    def record_failure(self) -> None:
+        if self._state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.OPEN)
+            return
+        self._record(False)
+        if self._state == CircuitState.CLOSED and self._should_open():
+            self._transition(CircuitState.OPEN)
+
+    def _record(self, success: bool) -> None:
+        now = self._clock()
+        self._outcomes.append((now, success))
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _should_open(self) -> bool:
+        if len(self._outcomes) < self.minimum_calls:
+            return False
+        failures = sum(1 for _, success in self._outcomes if not success)
+        return failures / len(self._outcomes) >= self.failure_rate_threshold
+
+    def _transition(self, state: CircuitState) -> None:
+        logger.warning(f"서킷 브레이커 상태 변경: {self._state.value} → {state.value}")
+        self._state = state
+        self._trial_calls = 0
+        self._trial_successes = 0
+        if state == CircuitState.OPEN:
+            self._opened_at = self._clock()
+        if state == CircuitState.CLOSED:
+            self._outcomes.clear()
@@ -0,0 +1,421 @@
+import logging
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def suggested_num_clusters(num_vectors: int) -> int:
+    """
+    클러스터(IVFFlat lists) 수 권장값
+
+    pgvector 권장: 100만 건 이하 rows / 1000, 그 이상 sqrt(rows)
+    """
+    if num_vectors <= 1_000_000:
+        return max(1, num_vectors // 1000)
+    return int(math.sqrt(num_vectors))
+
+
+def _kmeans_plus_plus(vectors: np.ndarray, num_clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """k-means++ 초기화: 이미 고른 중심점과 먼 점일수록 높은 확률로 선택"""
+    centroids = [vectors[rng.integers(len(vectors))]]
+    distances = 1.0 - vectors @ centroids[0]
+    for _ in range(1, num_clusters):
+        weights = np.clip(distances, 0.0, None) ** 2
+        total = weights.sum()
+        index = rng.choice(len(vectors), p=weights / total) if total > 0 else rng.integers(len(vectors))
+        centroids.append(vectors[index])
+        distances = np.minimum(distances, 1.0 - vectors @ vectors[index])
+    return np.array(centroids, dtype=np.float32)
+
+
+def train_centroids(
+    vectors: np.ndarray,
+    num_clusters: int,
+    batch_size: int = 1024,
+    iterations: int = 100,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    mini-batch k-means (코사인 유사도 기준, 중심점은 단위 벡터)
+
+    매 반복마다 batch_size개 샘플만 할당/갱신하므로 전체 코퍼스 크기와 무관하게
+    반복당 비용이 일정합니다. (Sculley, 2010)
+    """
+    rng = np.random.default_rng(seed)
+    # 코퍼스 전체를 정규화한 사본을 만들지 않고 뽑은 표본만 정규화
+    vectors = np.asarray(vectors, dtype=np.float32)
+    num_clusters = min(num_clusters, len(vectors))
+
+    # 초기화는 최대 batch_size * 10개 표본에서 수행 (대규모 코퍼스에서도 비용 일정)
+    sample = _normalize(
+        vectors[rng.choice(len(vectors), min(len(vectors), batch_size * 10), replace=False)]
+    )
+    centroids = _kmeans_plus_plus(sample, num_clusters, rng)
+    counts = np.zeros(num_clusters, dtype=np.int64)
+
+    for _ in range(iterations):
+        batch = _normalize(
+            vectors[rng.choice(len(vectors), min(batch_size, len(vectors)), replace=False)]
+        )
+        assignments = (batch @ centroids.T).argmax(axis=1)
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, batch)
+        batch_counts = np.bincount(assignments, minlength=num_clusters)
+
+        # 중심점별 학습률 1/count: 배치 점들을 순차 반영한 것과 같은 누적 평균
+        updated = batch_counts > 0
+        new_counts = counts + batch_counts
+        centroids[updated] = (
+            centroids[updated] * counts[updated, None] + sums[updated]
+        ) / new_counts[updated, None]
+        counts = new_counts
+
+    return _normalize(centroids)
+
+
+@dataclass
+class ClusterAssignment:
+    """학습된 중심점과 그 중심점 기준의 행별 배정 결과 (`ClusterIndex.swap()`으로 한 번에 교체)"""
+
+    centroids: np.ndarray
+    assignments: np.ndarray  # 행 번호 → cluster_id
+    counts: np.ndarray
+    members: list[set[int]]  # 클러스터별 행 번호
+
+
+def assign_clusters(
+    vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 16384
+) -> ClusterAssignment:
+    """
+    모든 벡터를 가장 가까운 중심점에 배정합니다.
+
+    인덱스 상태를 건드리지 않으므로 재학습 시 이벤트 루프 밖(스레드)에서 호출합니다.
+    유사도 행렬(벡터 수 × 클러스터 수)은 chunk_size행씩 계산해 메모리를 제한합니다.
+    """
+    centroids = np.asarray(centroids, dtype=np.float32)
+    num_clusters = len(centroids)
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk_size):
+        chunk = vectors[start : start + chunk_size]
+        assignments[start : start + len(chunk)] = (chunk @ centroids.T).argmax(axis=1)
+    counts = np.bincount(assignments, minlength=num_clusters).astype(np.int64)
+    # 행 번호를 cluster_id 순으로 정렬해 클러스터별로 자름
+    groups = np.split(np.argsort(assignments, kind="stable"), np.cumsum(counts)[:-1])
+    return ClusterAssignment(
+        centroids=centroids,
+        assignments=assignments,
+        counts=counts,
+        members=[set(group.tolist()) for group in groups],
+    )
+
+
+@dataclass
+class ClusterBalance:
+    sizes: list[int]
+    max_ratio: float  # 가장 큰 클러스터 크기 / 평균 크기
+    coefficient_of_variation: float
+    needs_retraining: bool
+
+
+class ClusterIndex:
+    """
+    클러스터 기반 coarse-to-fine 검색 인덱스
+
+    1. 쿼리와 가장 가까운 nprobe개 중심점을 고름 (coarse)
+    2. 해당 클러스터 멤버들과만 정확한 코사인 유사도 계산 (fine)
+
+    새 벡터는 가장 가까운 클러스터에 배정하면서 중심점을 누적 평균으로 갱신하고,
+    클러스터 크기가 한쪽으로 쏠리면 `balance().needs_retraining`으로 재학습 필요를 알립니다.
+    클러스터 멤버 목록은 그대로 주제별 리포트 탐색에 사용할 수 있습니다.
+    """
+
+    def __init__(self, dimension: int = 1536, imbalance_threshold: float = 3.0):
+        self.dimension = dimension
+        self.imbalance_threshold = imbalance_threshold
+        self.centroids = np.empty((0, dimension), dtype=np.float32)
+        self._counts = np.empty(0, dtype=np.int64)
+
+        self._vectors = np.empty((0, dimension), dtype=np.float32)
+        self._report_ids = np.empty(0, dtype=np.int64)
+        self._assignments = np.empty(0, dtype=np.int64)
+        self._size = 0
+        self._rows: dict[int, int] = {}  # report_id → 행 번호
+        self._members: list[set[int]] = []  # 클러스터별 행 번호
+        self._changed_rows: set[int] | None = None  # 재학습 중 추가/갱신된 행
+        self._removed_rows: set[int] = set()  # 재학습 중 제거되어 swap() 때 정리할 행
+
+    def __len__(self) -> int:
+        return self._size - len(self._removed_rows)
+
+    @property
+    def num_clusters(self) -> int:
+        return len(self.centroids)
+
+    def begin_retrain(self) -> np.ndarray:
+        """
+        재학습용 벡터 사본을 만들고, 이후 추가/갱신되는 행을 기록하기 시작합니다.
+
+        사본으로 스레드에서 학습/배정하는 동안에도 검색과 add가 가능하며,
+        `swap()` 시 기록된 행만 새 중심점에 다시 배정합니다.
+        """
+        self._changed_rows = set()
+        return self._vectors[: self._size].copy()
+
+    def abort_retrain(self) -> None:
+        self._changed_rows = None
+        self._delete_removed_rows()
+
+    def fit(
+        self,
+        report_ids: list[int] | np.ndarray,
+        vectors: np.ndarray,
+        num_clusters: int | None = None,
+    ) -> None:
+        """벡터를 적재하고 클러스터를 학습합니다."""
+        self.extend(report_ids, vectors)
+        self.train(num_clusters)
+
+    def train(self, num_clusters: int | None = None) -> None:
+        """적재된 벡터로 클러스터를 학습합니다."""
+        num_clusters = num_clusters or suggested_num_clusters(self._size)
+        self.set_centroids(train_centroids(self._vectors[: self._size], num_clusters))
+
+    def reserve(self, rows: int) -> None:
+        """
+        rows행을 담을 배열을 미리 확보합니다.
+
+        시작 시 저장소 건수를 알고 적재하면 배열을 두 배씩 키우며 복사하지 않으므로
+        최대 메모리가 코퍼스 크기 1배에 머뭅니다.
+        """
+        if rows > len(self._vectors):
+            self._resize(rows)
+
+    def extend(self, report_ids: list[int] | np.ndarray, vectors: np.ndarray) -> None:
+        """
+        벡터 묶음을 배열에 바로 복사해 적재합니다. (배정은 `train()`/`swap()` 때)
+
+        저장소에서 배치 단위로 읽으며 호출하면 배치를 모아 이어 붙이지 않아도 됩니다.
+        """
+        report_ids = [int(report_id) for report_id in report_ids]
+        if len(set(report_ids)) != len(report_ids) or any(r in self._rows for r in report_ids):
+            # 이미 있는 리포트는 행을 갱신해야 하므로 한 행씩 처리
+            for report_id, vector in zip(report_ids, vectors):
+                self._store(report_id, vector)
+            return
+
+        start, end = self._size, self._size + len(report_ids)
+        if end > len(self._vectors):
+            self._resize(max(end, len(self._vectors) * 2))
+        rows = self._vectors[start:end]
+        np.copyto(rows, vectors, casting="same_kind")
+        norms = np.sqrt(np.einsum("ij,ij->i", rows, rows))
+        rows /= np.where(norms == 0, 1.0, norms)[:, None]
+        self._report_ids[start:end] = report_ids
+        self._assignments[start:end] = -1
+        self._rows.update(zip(report_ids, range(start, end)))
+        self._size = end
+        if self._changed_rows is not None:
+            self._changed_rows.update(range(start, end))
+
+    def set_centroids(self, centroids: np.ndarray) -> None:
+        """(재)학습된 중심점으로 교체하고 전체 벡터를 다시 배정합니다."""
+        self.swap(assign_clusters(self._vectors[: self._size], centroids))
+
+    def swap(self, assignment: ClusterAssignment) -> None:
+        """
+        `assign_clusters()` 결과로 중심점과 배정을 한 번에 교체합니다.
+
+        `begin_retrain()` 이후 추가/갱신된 행만 새 중심점에 다시 배정하므로
+        비용은 학습 중 변경된 행 수에 비례합니다.
+        """
+        rows = len(assignment.assignments)
+        changed = (self._changed_rows or set()) | set(range(rows, self._size))
+        self._changed_rows = None
+
+        self.centroids = assignment.centroids
+        self._assignments[:rows] = assignment.assignments
+        self._assignments[rows : self._size] = -1
+        self._counts = assignment.counts
+        self._members = assignment.members
+        for row in self._removed_rows:
+            self._detach(row)
+        for row in sorted(changed - self._removed_rows):
+            self._assign(row)
+        self._delete_removed_rows()
+
+        logger.info(
+            f"클러스터 학습 완료 (vectors: {self._size}, clusters: {self.num_clusters})"
+        )
+
+    def _store(self, report_id: int, vector: np.ndarray) -> int:
+        vector = _normalize(np.asarray(vector, dtype=np.float32))
+        row = self._rows.get(report_id)
+        if row is None:
+            if self._size == len(self._vectors):
+                self._grow()
+            row = self._size
+            self._size += 1
+            self._rows[report_id] = row
+            self._report_ids[row] = report_id
+            self._assignments[row] = -1
+        self._vectors[row] = vector
+        if self._changed_rows is not None:
+            self._changed_rows.add(row)
+        return row
+
+    def _grow(self) -> None:
+        self._resize(max(1024, len(self._vectors) * 2))
+
+    def _resize(self, capacity: int) -> None:
+        vectors = np.empty((capacity, self.dimension), dtype=np.float32)
+        vectors[: self._size] = self._vectors[: self._size]
+        report_ids = np.empty(capacity, dtype=np.int64)
+        report_ids[: self._size] = self._report_ids[: self._size]
+        assignments = np.full(capacity, -1, dtype=np.int64)
+        assignments[: self._size] = self._assignments[: self._size]
+        self._vectors, self._report_ids, self._assignments = vectors, report_ids, assignments
+
+    def add(self, report_id: int, vector: np.ndarray | list[float]) -> int:
+        """
+        벡터를 가장 가까운 클러스터에 배정하고 중심점을 점진 갱신합니다.
+
+        Returns:
+            배정된 cluster_id (학습 전이면 -1)
+        """
+        row = self._store(report_id, vector)
+        if self.num_clusters == 0:
+            return -1
+        return self._assign(row)
+
+    def remove(self, report_id: int) -> bool:
+        """
+        리포트를 인덱스에서 제거합니다. (근접 중복이 되어 대표 리포트만 남기는 경우 등)
+
+        Returns:
+            인덱스에 있었으면 True
+        """
+        row = self._rows.pop(report_id, None)
+        if row is None:
+            return False
+
+        self._detach(row)
+        if self._changed_rows is not None:
+            # 재학습 중에는 행 번호가 스냅샷과 맞아야 하므로 swap() 때 정리
+            self._removed_rows.add(row)
+        else:
+            self._delete_row(row)
+        return True
+
+    def _detach(self, row: int) -> None:
+        cluster_id = int(self._assignments[row])
+        if cluster_id >= 0:
+            self._members[cluster_id].discard(row)
+            self._counts[cluster_id] -= 1
+            self._assignments[row] = -1
+
+    def _delete_row(self, row: int) -> None:
+        """마지막 행을 빈 자리로 옮겨 배열을 빈틈없이 유지합니다."""
+        self._detach(row)
+        last = self._size - 1
+        if row != last:
+            cluster_id = int(self._assignments[last])
+            self._vectors[row] = self._vectors[last]
+            self._report_ids[row] = self._report_ids[last]
+            self._assignments[row] = cluster_id
+            self._rows[int(self._report_ids[last])] = row
+            if cluster_id >= 0:
+                self._members[cluster_id].discard(last)
+                self._members[cluster_id].add(row)
+        self._size -= 1
+
+    def _delete_removed_rows(self) -> None:
+        # 뒤쪽 행부터 지워야 옮겨지는 마지막 행이 아직 지울 행이 아님
+        for row in sorted(self._removed_rows, reverse=True):
+            self._delete_row(row)
+        self._removed_rows.clear()
+
+    def _assign(self, row: int) -> int:
+        self._detach(row)
+
+        vector = self._vectors[row]
+        cluster_id = int((self.centroids @ vector).argmax())
+        self._assignments[row] = cluster_id
+        self._members[cluster_id].add(row)
+        self._counts[cluster_id] += 1
+
+        # 누적 평균: c += (x - c) / n
+        centroid = self.centroids[cluster_id]
+        centroid += (vector - centroid) / self._counts[cluster_id]
+        self.centroids[cluster_id] = _normalize(centroid)
+        return cluster_id
+
+    def search(
+        self,
+        query: np.ndarray | list[float],
+        k: int = 10,
+        nprobe: int = 4,
+    ) -> list[tuple[int, float]]:
+        """
+        가장 가까운 nprobe개 클러스터 안에서 코사인 유사도 상위 k개를 찾습니다.
+
+        Returns:
+            (report_id, similarity) 목록 (유사도 내림차순)
+        """
+        if self._size == 0:
+            return []
+
+        query = _normalize(np.asarray(query, dtype=np.float32))
+        if self.num_clusters == 0:
+            # 학습 전에는 전체 탐색
+            rows = np.arange(self._size)
+            if self._removed_rows:
+                rows = np.setdiff1d(rows, list(self._removed_rows))
+        else:
+            nprobe = min(nprobe, self.num_clusters)
+            probes = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+            rows = np.fromiter(
+                (row for cluster_id in probes for row in self._members[cluster_id]),
+                dtype=np.int64,
+            )
+        if len(rows) == 0:
+            return []
+
+        similarities = self._vectors[rows] @ query
+        top = min(k, len(rows))
+        order = np.argpartition(-similarities, top - 1)[:top]
+        order = order[np.argsort(-similarities[order])]
+        return [(int(self._report_ids[rows[i]]), float(similarities[i])) for i in order]
+
+    def members(self, cluster_id: int) -> list[int]:
+        """클러스터에 속한 report_id 목록 (주제별 탐색)"""
+        return sorted(int(self._report_ids[row]) for row in self._members[cluster_id])
+
+    def cluster_of(self, report_id: int) -> int | None:
+        row = self._rows.get(report_id)
+        return None if row is None else int(self._assignments[row])
+
+    def balance(self) -> ClusterBalance:
+        sizes = self._counts.tolist()
+        num_vectors = len(self)
+        # 코퍼스가 커져 권장 클러스터 수의 2배를 넘어가도 재학습 대상 (학습 전 인덱스에 벡터가 쌓인 경우 포함)
+        outgrown = num_vectors > 0 and suggested_num_clusters(num_vectors) >= self.num_clusters * 2
+        if not sizes or num_vectors == 0:
+            return ClusterBalance(sizes, 0.0, 0.0, needs_retraining=outgrown)
+
+        mean = num_vectors / len(sizes)
+        max_ratio = max(sizes) / mean
+        return ClusterBalance(
+            sizes=sizes,
+            max_ratio=round(max_ratio, 3),
+            coefficient_of_variation=round(float(np.std(sizes) / mean), 3),
+            needs_retraining=max_ratio >= self.imbalance_threshold or outgrown,
+        )
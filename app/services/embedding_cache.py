@@ -0,0 +1,38 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    (model, text_digest) → 벡터 LRU 캐시
+
+    같은 모델에 같은 텍스트면 벡터도 같으므로 다이제스트를 키로 사용합니다.
+    벡터는 복사하지 않고 읽기 전용 배열 참조를 그대로 보관/반환합니다.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], np.ndarray] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, model: str, digest: str) -> np.ndarray | None:
+        vector = self._entries.get((model, digest))
+        if vector is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end((model, digest))
+        self.hits += 1
+        return vector
+
+    def put(self, model: str, digest: str, vector: np.ndarray) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[(model, digest)] = vector
+        self._entries.move_to_end((model, digest))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
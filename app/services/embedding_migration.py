@@ -0,0 +1,208 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import IO, Any
+
+import orjson
+
+from app.services.embedding_service import EmbeddingService
+from app.services.vector_store import EmbeddingRecord, VectorStore
+from app.utils.text_processor import extract_embedding_texts, iter_ndjson_lines
+
+logger = logging.getLogger(__name__)
+
+# (report_id, report_title, report JSON)
+ReportSource = tuple[int, str | None, dict[str, Any]]
+
+
+def read_report_sources(source: bytes | IO[bytes]) -> Iterator[ReportSource]:
+    """
+    NDJSON에서 마이그레이션 대상 리포트를 읽습니다.
+
+    한 줄에 {"report_id": 1, "report_title": "...", "report": {...}} 하나
+    """
+    for line in iter_ndjson_lines(source):
+        item = orjson.loads(line)
+        yield item["report_id"], item.get("report_title"), item["report"]
+
+
+@dataclass
+class MigrationProgress:
+    target_model: str
+    processed: int = 0
+    embedded: int = 0
+    skipped: int = 0  # 대상 모델 벡터가 이미 같은 다이제스트로 존재
+    failed: int = 0
+    done: bool = False
+
+
+class EmbeddingMigration:
+    """
+    임베딩 모델 마이그레이션
+
+    1. 대상 모델을 embedding_models에 등록 (live 아님)
+    2. 백그라운드에서 리포트를 대상 모델로 재임베딩해 기존 벡터 옆에 저장
+    3. 커버리지 확인 후 `switch()`로 검색 대상 모델을 원자적으로 전환
+
+    전환 전까지 검색은 기존 live 모델 벡터만 사용합니다.
+    report_embeddings.embedding 컬럼은 한 차원(vector(1536))이라 대상 모델도
+    같은 차원으로 출력해야 합니다 (text-embedding-3 계열은 `dimensions`로 맞춤).
+    배치마다 `embed_many`로 한 번에 임베딩하고, 최대 concurrency개 배치를 동시에 처리합니다.
+    """
+
+    def __init__(
+        self,
+        store: VectorStore,
+        service: EmbeddingService,
+        batch_size: int = 100,
+        concurrency: int = 4,
+    ):
+        self.store = store
+        self.service = service
+        self.batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.progress = MigrationProgress(target_model=service.model)
+        self._task: asyncio.Task | None = None
+
+    def start(self, reports: Iterable[ReportSource] | AsyncIterable[ReportSource]) -> asyncio.Task:
+        """재임베딩을 백그라운드 태스크로 시작합니다."""
+        self._task = asyncio.create_task(self.run(reports))
+        return self._task
+
+    async def run(
+        self, reports: Iterable[ReportSource] | AsyncIterable[ReportSource]
+    ) -> MigrationProgress:
+        await self._check_dimension()
+        await self.store.register_model(self.service.model, self.service.dimension)
+        logger.info(f"임베딩 마이그레이션 시작 (target: {self.service.model})")
+
+        tasks: set[asyncio.Task] = set()
+        batch: list[ReportSource] = []
+        async for source in _aiter(reports):
+            batch.append(source)
+            if len(batch) >= self.batch_size:
+                await self._schedule(batch, tasks)
+                batch = []
+        if batch:
+            await self._schedule(batch, tasks)
+        await asyncio.gather(*tasks)
+
+        self.progress.done = True
+        logger.info(
+            f"임베딩 마이그레이션 완료 (embedded: {self.progress.embedded}, "
+            f"skipped: {self.progress.skipped}, failed: {self.progress.failed})"
+        )
+        return self.progress
+
+    async def _check_dimension(self) -> None:
+        """
+        대상 모델의 실제 출력 차원이 저장 차원과 같은지 시작 전에 확인합니다.
+
+        Raises:
+            ValueError: 차원이 다른 경우 (모든 upsert가 실패하므로 시작하지 않음)
+        """
+        [probe] = await self.service.embed_many(["dimension check"])
+        if probe.dimension != self.service.dimension:
+            raise ValueError(
+                f"{self.service.model} 출력 차원 {probe.dimension} ≠ 저장 차원 "
+                f"{self.service.dimension}: 같은 차원의 모델만 나란히 저장할 수 있습니다"
+            )
+
+    async def _schedule(self, batch: list[ReportSource], tasks: set[asyncio.Task]) -> None:
+        # 동시 배치 수가 찼으면 읽기를 멈춰 메모리에 배치가 쌓이지 않게 함
+        await self._semaphore.acquire()
+        task = asyncio.create_task(self._run_batch(batch))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    async def _run_batch(self, batch: list[ReportSource]) -> None:
+        try:
+            await self._process_batch(batch)
+        finally:
+            self._semaphore.release()
+
+    async def _process_batch(self, batch: list[ReportSource]) -> None:
+        model = self.service.model
+        self.progress.processed += len(batch)
+        try:
+            existing = await self.store.digests(model, [report_id for report_id, _, _ in batch])
+        except Exception as e:
+            logger.error(f"다이제스트 조회 실패 ({len(batch)}건): {e}")
+            self.progress.failed += len(batch)
+            return
+
+        pending: list[tuple[int, str | None, str, str]] = []
+        texts = extract_embedding_texts(report for _, _, report in batch)
+        for (report_id, report_title, _), (text, digest) in zip(batch, texts):
+            if not text.strip() or existing.get(report_id) == digest:
+                self.progress.skipped += 1
+                continue
+            pending.append((report_id, report_title, text, digest))
+        if not pending:
+            return
+
+        try:
+            results = await self.service.embed_many([text for _, _, text, _ in pending])
+        except Exception as e:
+            logger.error(f"재임베딩 실패 ({len(pending)}건): {e}")
+            self.progress.failed += len(pending)
+            return
+
+        records: list[EmbeddingRecord] = []
+        for (report_id, report_title, _, digest), result in zip(pending, results):
+            if result.dimension != self.service.dimension:
+                logger.error(
+                    f"재임베딩 차원 불일치 (report_id: {report_id}): {result.dimension}"
+                )
+                self.progress.failed += 1
+                continue
+            records.append(
+                EmbeddingRecord(
+                    report_id=report_id,
+                    embedding=result.vector,
+                    model=model,
+                    text_digest=digest,
+                    report_title=report_title,
+                )
+            )
+
+        try:
+            await self.store.upsert_many(records)
+        except Exception as e:
+            logger.error(f"재임베딩 저장 실패 ({len(records)}건): {e}")
+            self.progress.failed += len(records)
+            return
+        self.progress.embedded += len(records)
+
+    async def switch(self, min_coverage: float = 1.0) -> None:
+        """
+        대상 모델 벡터 수가 현재 live 모델의 min_coverage 비율 이상이면 전환합니다.
+
+        Raises:
+            RuntimeError: 재임베딩이 끝나지 않았거나 커버리지가 부족한 경우
+        """
+        if self._task is not None and not self._task.done():
+            raise RuntimeError("재임베딩이 아직 진행 중입니다")
+
+        target = self.service.model
+        live = await self.store.live_model()
+        if live is not None and live != target:
+            live_count = await self.store.count(live)
+            target_count = await self.store.count(target)
+            if target_count < live_count * min_coverage:
+                raise RuntimeError(
+                    f"커버리지 부족: {target} {target_count}건 / {live} {live_count}건"
+                )
+
+        await self.store.activate_model(target)
+        logger.info(f"검색 대상 모델 전환: {live} → {target}")
+
+
+async def _aiter(items: Iterable[ReportSource] | AsyncIterable[ReportSource]):
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
@@ -1,33 +1,151 @@
 import logging
+from dataclasses import dataclass
 
-from openai import AsyncOpenAI, APIError, RateLimitError, APIConnectionError
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-)
+import numpy as np
 
 from app.core.config import get_settings
+from app.services.near_duplicate import NearDuplicate
+from app.utils.text_processor import text_digest
+from app.utils.vector_codec import decode_embedding
 
 logger = logging.getLogger(__name__)
 
 
+def supports_dimensions(model: str) -> bool:
+    """출력 차원을 `dimensions`로 줄일 수 있는 모델인지 (text-embedding-3 계열)"""
+    return model.startswith("text-embedding-3")
+
+
+@dataclass
+class EmbeddingResult:
+    """
+    모델, 차원, 입력 텍스트 다이제스트가 기록된 임베딩 벡터
+
+    vector는 읽기 전용 float32 배열이며 캐시, 인덱스, 저장소, 응답 직렬화까지
+    복사 없이 같은 버퍼를 참조합니다.
+    """
+
+    vector: np.ndarray
+    model: str
+    text_digest: str
+    # OpenAI 장애로 서킷이 열린 상태에서 캐시/대체 백엔드로 응답한 경우
+    degraded: bool = False
+    # 근접 중복 텍스트가 인덱스에 있었던 경우 (reused면 그 임베딩을 그대로 사용)
+    near_duplicate: NearDuplicate | None = None
+
+    @property
+    def dimension(self) -> int:
+        return len(self.vector)
+
+
 class EmbeddingService:
-    def __init__(self):
+    """
+    OpenAI 임베딩 서비스
+
+    openai, tenacity는 임포트 비용이 커서 모듈 로드 시점이 아닌
+    `warm_up()`(또는 첫 호출) 시점에 임포트합니다.
+    """
+
+    def __init__(
+        self,
+        model: str | None = None,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        dimension: int | None = None,
+    ):
         settings = get_settings()
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-        self.model = settings.EMBEDDING_MODEL
-        self.dimension = settings.EMBEDDING_DIMENSION
-
-    @retry(
-        retry=retry_if_exception_type((RateLimitError, APIConnectionError)),
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        before_sleep=lambda retry_state: logger.warning(
-            f"Retry attempt {retry_state.attempt_number} after error"
-        ),
-    )
+        # base_url을 지정하면 OpenAI 호환 로컬 서버를 사용 (장애 시 대체 백엔드)
+        self._base_url = base_url
+        self._api_key = api_key or settings.OPENAI_API_KEY
+        self._timeout = settings.OPENAI_TIMEOUT
+        self._client = None
+        # 모델 마이그레이션 시 새 모델용 서비스를 따로 생성
+        self.model = model or settings.EMBEDDING_MODEL
+        # text-embedding-3 계열은 요청에 dimensions를 넣어 이 차원으로 출력 (report_embeddings.embedding 컬럼 차원)
+        self.dimension = dimension or settings.EMBEDDING_DIMENSION
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(
+                api_key=self._api_key,
+                base_url=self._base_url,
+                timeout=self._timeout,
+                # 재시도는 tenacity가 담당 (SDK 재시도와 겹치면 장애 시 대기 시간이 곱절로 늘어남)
+                max_retries=0,
+            )
+        return self._client
+
+    def warm_up(self) -> None:
+        """무거운 의존성을 임포트하고 클라이언트를 생성합니다. (스레드에서 호출 가능)"""
+        import tenacity  # noqa: F401
+
+        _ = self.client
+
+    @staticmethod
+    def is_upstream_error(error: Exception) -> bool:
+        """OpenAI API 호출 자체의 오류인지 판별합니다."""
+        from openai import APIError
+
+        return isinstance(error, APIError)
+
+    @staticmethod
+    def is_outage_error(error: Exception) -> bool:
+        """
+        서킷 브레이커 실패로 셀 오류인지 판별합니다.
+
+        타임아웃, 연결 오류, 429, 5xx만 OpenAI 장애로 봅니다.
+        400/401/404 등 나머지 4xx는 요청 쪽 문제라 서킷을 열지 않습니다.
+        """
+        from openai import APIConnectionError, APIStatusError, RateLimitError
+
+        if isinstance(error, (APIConnectionError, RateLimitError)):
+            return True
+        return isinstance(error, APIStatusError) and error.status_code >= 500
+
+    def _retrying(self):
+        from openai import APIConnectionError, RateLimitError
+        from tenacity import (
+            AsyncRetrying,
+            retry_if_exception_type,
+            stop_after_attempt,
+            wait_exponential,
+        )
+
+        return AsyncRetrying(
+            retry=retry_if_exception_type((RateLimitError, APIConnectionError)),
+            stop=stop_after_attempt(3),
+            wait=wait_exponential(multiplier=1, min=2, max=10),
+            before_sleep=lambda retry_state: logger.warning(
+                f"Retry attempt {retry_state.attempt_number} after error"
+            ),
+            # 재시도 후에도 실패하면 RetryError 대신 원래 OpenAI 예외를 전달
+            reraise=True,
+        )
+
+    async def embed(self, text: str) -> EmbeddingResult:
+        """텍스트를 임베딩하고 모델/다이제스트 정보를 함께 반환합니다."""
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: list[str]) -> list[EmbeddingResult]:
+        """여러 텍스트를 한 번의 API 호출로 임베딩합니다."""
+        vectors = await self._create_vectors(texts)
+        return [
+            EmbeddingResult(
+                vector=vector,
+                model=self.model,
+                text_digest=text_digest(text),
+            )
+            for text, vector in zip(texts, vectors)
+        ]
+
+    async def _create_vectors(self, texts: list[str]) -> list[np.ndarray]:
+        async for attempt in self._retrying():
+            with attempt:
+                return await self._request_embeddings(texts)
+
     async def create_embedding(self, text: str) -> list[float]:
         """
         텍스트를 임베딩 벡터로 변환합니다.
@@ -41,14 +159,39 @@ class EmbeddingService:
         Raises:
             APIError: OpenAI API 오류 (재시도 후에도 실패 시)
         """
+        return (await self.create_embeddings([text]))[0]
+
+    async def create_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """
+        여러 텍스트를 한 번의 API 호출로 임베딩합니다. (입력 순서 유지)
+
+        float 목록이 필요한 호출자용이며, 서버 내부 경로는 배열을 그대로 쓰는 `embed_many()`를 사용합니다.
+
+        Raises:
+            APIError: OpenAI API 오류 (재시도 후에도 실패 시)
+        """
+        return [vector.tolist() for vector in await self._create_vectors(texts)]
+
+    async def _request_embeddings(self, texts: list[str]) -> list[np.ndarray]:
         try:
+            # encoding_format을 지정하면 SDK가 float 목록으로 풀지 않고 base64 문자열을 그대로 반환
+            options = {"dimensions": self.dimension} if supports_dimensions(self.model) else {}
             response = await self.client.embeddings.create(
                 model=self.model,
-                input=text,
+                input=texts,
+                encoding_format="base64",
+                **options,
             )
-            return response.data[0].embedding
-        except (RateLimitError, APIConnectionError):
-            raise
-        except APIError as e:
-            logger.error(f"OpenAI API error: {e}")
+            return [
+                decode_embedding(item.embedding)
+                for item in sorted(response.data, key=lambda item: item.index)
+            ]
+        except Exception as e:
+            from openai import APIConnectionError, APIError, RateLimitError
+
+            # RateLimitError, APIConnectionError는 재시도 대상이므로 로그 생략
+            if isinstance(e, APIError) and not isinstance(
+                e, (RateLimitError, APIConnectionError)
+            ):
+                logger.error(f"OpenAI API error: {e}")
             raise
@@ -0,0 +1,208 @@
+import hashlib
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+# 2^61 - 1 (메르센 소수): (a * h + b) mod p 해시 순열에 사용
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def shingles(text: str, size: int = 5) -> set[str]:
+    """
+    정규화한 텍스트의 글자 size-gram 집합
+
+    단어 단위보다 글자 단위가 한국어 조사/어미 변화에 덜 민감하고,
+    구현 항목 순서가 바뀌어도 경계 부분 shingle만 달라집니다.
+    """
+    normalized = _WHITESPACE.sub(" ", text.lower()).strip()
+    if len(normalized) <= size:
+        return {normalized}
+    return {normalized[i : i + size] for i in range(len(normalized) - size + 1)}
+
+
+def _hash_shingles(items: set[str]) -> np.ndarray:
+    """shingle → 32비트 해시 (프로세스마다 달라지는 hash() 대신 blake2b 사용)"""
+    return np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(item.encode(), digest_size=4).digest(), "little")
+            for item in items
+        ),
+        dtype=np.uint64,
+        count=len(items),
+    )
+
+
+@dataclass
+class NearDuplicate:
+    key: str  # 비슷한 텍스트의 text_digest
+    similarity: float  # MinHash로 추정한 Jaccard 유사도
+    reused: bool = False  # True면 해당 텍스트의 임베딩을 재사용 (OpenAI 호출 생략)
+
+
+@dataclass
+class ReportLink:
+    canonical: int  # 그룹 대표 report_id (자기 자신이면 중복 아님)
+    # 대표였던 리포트가 그룹을 떠나 새로 대표가 된 리포트 (검색 인덱스에 새로 넣어야 함)
+    promoted: int | None = None
+    promoted_key: str | None = None  # 새 대표 리포트의 text_digest
+
+
+class NearDuplicateIndex:
+    """
+    MinHash + LSH 기반 근접 중복 텍스트 인덱스 (메모리)
+
+    - 텍스트마다 num_perm개 MinHash 값을 계산하고, 이를 bands개 구간으로 나눠
+      구간 하나라도 완전히 같은 텍스트만 후보로 봅니다. (기본 16×8: Jaccard 약 0.7부터 후보)
+    - 후보 중 추정 유사도가 threshold 이상인 가장 비슷한 텍스트를 근접 중복으로 판단합니다.
+    - 근접 중복끼리는 그룹으로 묶이고, 그룹에 연결된 첫 report_id가 대표 리포트가 됩니다.
+
+    max_entries를 넘으면 가장 오래된 텍스트부터 인덱스에서 제거합니다.
+    연결된 리포트도 max_entries개까지만 기억하며, 가장 오래 연결되지 않은 리포트부터 잊습니다.
+    (대표 리포트를 잊으면 그룹 전체를 잊음. 남은 리포트가 조용히 대표로 바뀌지 않도록)
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 5,
+        max_entries: int = 100_000,
+        seed: int = 1,
+    ):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm은 bands의 배수여야 합니다")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+
+        # a, b < 2^32, 해시 < 2^32 이므로 a * h + b가 uint64 범위 안에 있음
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=(num_perm, 1), dtype=np.uint64)
+
+        self._signatures: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._buckets: list[dict[bytes, set[str]]] = [{} for _ in range(bands)]
+        self._groups: dict[str, str] = {}  # key → 그룹 대표 key
+        self._group_reports: dict[str, list[int]] = {}  # 그룹 대표 key → report_id 목록
+        self._report_groups: dict[int, str] = {}  # report_id → 그룹 대표 key
+        # report_id → 연결된 텍스트 key (연결 순서 = 제거 순서)
+        self._report_keys: OrderedDict[int, str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = _hash_shingles(shingles(text, self.shingle_size))
+        return ((self._a * hashes + self._b) % _MERSENNE_PRIME).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        return [band.tobytes() for band in signature.reshape(self.bands, self.rows)]
+
+    def query(self, signature: np.ndarray) -> NearDuplicate | None:
+        """threshold 이상인 가장 비슷한 텍스트를 찾습니다."""
+        candidates: set[str] = set()
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(band_key, ()))
+
+        best: NearDuplicate | None = None
+        for key in candidates:
+            similarity = float(np.mean(self._signatures[key] == signature))
+            if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                best = NearDuplicate(key=key, similarity=similarity)
+        return best
+
+    def add(self, key: str, signature: np.ndarray, duplicate_of: str | None = None) -> None:
+        """
+        텍스트를 인덱스에 등록합니다.
+
+        Args:
+            duplicate_of: 미리 query()로 찾은 근접 중복 key (이 텍스트의 그룹에 합류)
+        """
+        if key in self._signatures:
+            self._signatures.move_to_end(key)
+            return
+
+        self._signatures[key] = signature
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(band_key, set()).add(key)
+        self._groups[key] = self._groups.get(duplicate_of, key) if duplicate_of else key
+
+        while len(self._signatures) > self.max_entries:
+            self._evict()
+
+    def _evict(self) -> None:
+        key, signature = self._signatures.popitem(last=False)
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            members = bucket.get(band_key)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del bucket[band_key]
+        # 그룹 정보(report 목록)는 대표 key 기준으로 유지
+        self._groups.pop(key, None)
+
+    def link_report(self, key: str, report_id: int) -> ReportLink:
+        """
+        report_id를 텍스트의 그룹에 연결합니다.
+
+        리포트 내용이 바뀌어 다른 그룹으로 옮겨 가면 이전 그룹에서 빠지고,
+        이전 그룹의 대표였다면 다음 리포트가 대표가 됩니다. (ReportLink.promoted)
+        """
+        if report_id not in self._report_keys:
+            while len(self._report_keys) >= self.max_entries:
+                self._evict_report()
+
+        group = self._groups.get(key, key)
+        previous = self._report_groups.get(report_id)
+        self._report_keys[report_id] = key
+        self._report_keys.move_to_end(report_id)
+        promoted = None
+        if previous != group:
+            if previous is not None:
+                reports = self._group_reports[previous]
+                was_canonical = reports[0] == report_id
+                reports.remove(report_id)
+                if not reports:
+                    del self._group_reports[previous]
+                elif was_canonical:
+                    promoted = reports[0]
+            self._group_reports.setdefault(group, []).append(report_id)
+            self._report_groups[report_id] = group
+        return ReportLink(
+            canonical=self._group_reports[group][0],
+            promoted=promoted,
+            promoted_key=self._report_keys.get(promoted) if promoted is not None else None,
+        )
+
+    def _evict_report(self) -> None:
+        report_id, _ = self._report_keys.popitem(last=False)
+        group = self._report_groups.pop(report_id)
+        reports = self._group_reports[group]
+        if reports[0] == report_id:
+            # 대표는 검색 인덱스에 남아 있고 나머지는 빠져 있으므로 그룹째 잊음
+            del self._group_reports[group]
+            for other in reports[1:]:
+                self._report_groups.pop(other, None)
+                self._report_keys.pop(other, None)
+        else:
+            reports.remove(report_id)
+
+    def report_for(self, key: str) -> int | None:
+        """텍스트가 속한 그룹의 대표 report_id (연결된 리포트가 없으면 None)"""
+        reports = self._group_reports.get(self._groups.get(key, key))
+        return reports[0] if reports else None
+
+    def duplicates_of(self, report_id: int) -> list[int]:
+        """같은 그룹의 다른 report_id 목록"""
+        group = self._report_groups.get(report_id)
+        if group is None:
+            return []
+        return [other for other in self._group_reports[group] if other != report_id]
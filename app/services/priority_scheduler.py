@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(str, Enum):
+    INTERACTIVE = "interactive"  # 단건 /embed (사용자 대기)
+    BULK = "bulk"  # 백필, 배치 스크립트
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    OpenAI 토큰 수 추정치
+
+    한국어는 대략 글자당 1토큰, 영어는 4글자당 1토큰이므로
+    한국어/영어 혼합 리포트 기준 보수적으로 2글자당 1토큰으로 계산합니다.
+    """
+    return len(text) // 2 + 1
+
+
+class TokenBucket:
+    """분당 토큰 한도 (최대 1분치까지 버스트 허용)"""
+
+    def __init__(self, tokens_per_minute: float, clock: Callable[[], float]):
+        self.capacity = tokens_per_minute
+        self.rate = tokens_per_minute / 60.0
+        self._clock = clock
+        self._tokens = tokens_per_minute
+        self._updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def take(self, tokens: float) -> None:
+        self._refill()
+        self._tokens -= tokens
+
+    def wait_time(self, tokens: float) -> float:
+        """tokens만큼 쌓일 때까지 남은 시간(초)"""
+        missing = min(tokens, self.capacity) - self.available()
+        return max(0.0, missing / self.rate) if self.rate > 0 else float("inf")
+
+
+@dataclass
+class _Lane:
+    weight: int
+    batch_size: int
+    bucket: TokenBucket
+    waiters: deque[tuple[asyncio.Future, int]] = field(default_factory=deque)
+    in_flight: int = 0
+    # stride scheduling: 슬롯을 받을 때마다 1/weight씩 증가, 작은 레인이 먼저 받음
+    virtual_time: float = 0.0
+
+
+class PriorityScheduler:
+    """
+    interactive/bulk 레인 가중 공정 스케줄러 (EmbeddingService 앞단)
+
+    - 동시 실행 슬롯 max_concurrency 중 interactive_reserved개는 interactive 전용
+      (bulk는 나머지 슬롯까지만 사용)
+    - 두 레인 모두 대기 중이면 weight 비율로 슬롯을 나눔
+    - 분당 토큰 한도 중 interactive_token_share만큼은 interactive 전용이며,
+      interactive는 부족하면 bulk 몫을 빌려 쓸 수 있지만 반대는 불가
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        interactive_reserved: int = 4,
+        interactive_weight: int = 4,
+        bulk_weight: int = 1,
+        tokens_per_minute: int = 1_000_000,
+        interactive_token_share: float = 0.3,
+        interactive_batch_size: int = 16,
+        bulk_batch_size: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        # bulk 슬롯이나 토큰 몫이 0이면 bulk 요청이 영원히 대기
+        if not 0 <= interactive_reserved < max_concurrency:
+            raise ValueError("interactive_reserved는 0 이상 max_concurrency 미만이어야 합니다")
+        if not 0 <= interactive_token_share < 1:
+            raise ValueError("interactive_token_share는 0 이상 1 미만이어야 합니다")
+
+        self.max_concurrency = max_concurrency
+        self.interactive_reserved = interactive_reserved
+        self._lanes = {
+            Priority.INTERACTIVE: _Lane(
+                weight=interactive_weight,
+                batch_size=interactive_batch_size,
+                bucket=TokenBucket(tokens_per_minute * interactive_token_share, clock),
+            ),
+            Priority.BULK: _Lane(
+                weight=bulk_weight,
+                batch_size=bulk_batch_size,
+                bucket=TokenBucket(tokens_per_minute * (1 - interactive_token_share), clock),
+            ),
+        }
+        self._retry_handle: asyncio.TimerHandle | None = None
+
+    def batch_size(self, priority: Priority) -> int:
+        return self._lanes[priority].batch_size
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {
+            priority.value: {"in_flight": lane.in_flight, "waiting": len(lane.waiters)}
+            for priority, lane in self._lanes.items()
+        }
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority, tokens: int) -> AsyncIterator[None]:
+        """슬롯과 토큰을 확보한 동안 실행합니다."""
+        await self.acquire(priority, tokens)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    async def acquire(self, priority: Priority, tokens: int) -> None:
+        lane = self._lanes[priority]
+        if not lane.waiters:
+            # 쉬고 있던 레인이 밀린 몫을 한꺼번에 가져가지 않도록 대기 중인 레인에 맞춤
+            active = [other.virtual_time for other in self._lanes.values() if other.waiters]
+            if active:
+                lane.virtual_time = max(lane.virtual_time, min(active))
+
+        future = asyncio.get_running_loop().create_future()
+        lane.waiters.append((future, tokens))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 슬롯을 받은 직후 취소된 경우 반납
+                self.release(priority)
+            else:
+                lane.waiters = deque(w for w in lane.waiters if w[0] is not future)
+            raise
+
+    def release(self, priority: Priority) -> None:
+        self._lanes[priority].in_flight -= 1
+        self._dispatch()
+
+    def _has_capacity(self, priority: Priority) -> bool:
+        in_flight = sum(lane.in_flight for lane in self._lanes.values())
+        if in_flight >= self.max_concurrency:
+            return False
+        if priority == Priority.BULK:
+            return self._lanes[Priority.BULK].in_flight < self.max_concurrency - self.interactive_reserved
+        return True
+
+    def _take_tokens(self, priority: Priority, tokens: int) -> bool:
+        own = self._lanes[priority].bucket
+        need = min(tokens, own.capacity)
+        if own.available() >= need:
+            own.take(need)
+            return True
+        if priority == Priority.INTERACTIVE:
+            shared = self._lanes[Priority.BULK].bucket
+            if shared.available() >= min(tokens, shared.capacity):
+                shared.take(min(tokens, shared.capacity))
+                return True
+        return False
+
+    def _token_wait_time(self, priority: Priority, tokens: int) -> float:
+        wait = self._lanes[priority].bucket.wait_time(tokens)
+        if priority == Priority.INTERACTIVE:
+            wait = min(wait, self._lanes[Priority.BULK].bucket.wait_time(tokens))
+        return wait
+
+    def _dispatch(self) -> None:
+        while True:
+            for lane in self._lanes.values():
+                while lane.waiters and lane.waiters[0][0].done():
+                    lane.waiters.popleft()
+
+            candidates = sorted(
+                (
+                    (lane.virtual_time, priority)
+                    for priority, lane in self._lanes.items()
+                    if lane.waiters and self._has_capacity(priority)
+                ),
+                key=lambda item: item[0],
+            )
+            if not candidates:
+                return
+
+            granted = False
+            shortest_wait = float("inf")
+            for _, priority in candidates:
+                lane = self._lanes[priority]
+                future, tokens = lane.waiters[0]
+                if self._take_tokens(priority, tokens):
+                    lane.waiters.popleft()
+                    lane.in_flight += 1
+                    lane.virtual_time += 1 / lane.weight
+                    future.set_result(None)
+                    granted = True
+                    break
+                shortest_wait = min(shortest_wait, self._token_wait_time(priority, tokens))
+
+            if not granted:
+                self._schedule_retry(shortest_wait)
+                return
+
+    def _schedule_retry(self, delay: float) -> None:
+        """토큰이 부족하면 충전될 시점에 다시 배분합니다."""
+        if delay == float("inf"):
+            return
+        if self._retry_handle is not None and not self._retry_handle.cancelled():
+            self._retry_handle.cancel()
+        self._retry_handle = asyncio.get_running_loop().call_later(delay, self._dispatch)
@@ -0,0 +1,335 @@
+import logging
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 대용량 코퍼스 점수 계산 시 (n, m) 임시 배열이 너무 커지지 않도록 나눠서 처리
+_SCORE_CHUNK_SIZE = 65536
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """코사인 유사도를 내적으로 계산할 수 있도록 L2 정규화합니다."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _kmeans(
+    data: np.ndarray,
+    num_centroids: int,
+    iterations: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """서브스페이스 코드북 학습용 Lloyd k-means"""
+    centroids = data[rng.choice(len(data), num_centroids, replace=False)].copy()
+
+    for _ in range(iterations):
+        # ||x - c||^2 = ||x||^2 - 2x·c + ||c||^2 에서 ||x||^2 는 argmin에 영향 없음
+        distances = -2.0 * data @ centroids.T + (centroids**2).sum(axis=1)
+        assignments = distances.argmin(axis=1)
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, data)
+        counts = np.bincount(assignments, minlength=num_centroids)
+
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+
+        # 빈 클러스터는 임의의 샘플로 재초기화
+        empty = np.flatnonzero(~filled)
+        if len(empty):
+            centroids[empty] = data[rng.choice(len(data), len(empty), replace=False)]
+
+    return centroids
+
+
+class ProductQuantizer:
+    """
+    Product Quantization 코덱
+
+    D차원 벡터를 M개의 서브벡터로 나누고 서브스페이스마다 256개 중심점을 학습해
+    벡터 하나를 M 바이트 코드로 압축합니다.
+    (1536차원 float32 6KB → M=96일 때 96바이트, 약 64배 압축)
+    """
+
+    def __init__(
+        self,
+        dimension: int = 1536,
+        num_subvectors: int = 96,
+        num_centroids: int = 256,
+    ):
+        if dimension % num_subvectors != 0:
+            raise ValueError(
+                f"dimension({dimension})은 num_subvectors({num_subvectors})로 나누어떨어져야 합니다"
+            )
+        if num_centroids > 256:
+            raise ValueError("num_centroids는 uint8 코드 범위(256) 이하여야 합니다")
+
+        self.dimension = dimension
+        self.num_subvectors = num_subvectors
+        self.num_centroids = num_centroids
+        self.subvector_dim = dimension // num_subvectors
+        # (M, K, D/M)
+        self.codebooks: np.ndarray | None = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.codebooks is not None
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        """(n, D) → (M, n, D/M)"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[None, :]
+        if vectors.shape[1] != self.dimension:
+            raise ValueError(
+                f"벡터 차원이 {self.dimension}이어야 합니다 (입력: {vectors.shape[1]})"
+            )
+        vectors = _normalize(vectors)
+        return vectors.reshape(len(vectors), self.num_subvectors, self.subvector_dim).transpose(1, 0, 2)
+
+    def train(
+        self,
+        samples: np.ndarray,
+        iterations: int = 20,
+        seed: int = 0,
+    ) -> "ProductQuantizer":
+        """
+        샘플 임베딩으로 서브스페이스 코드북을 학습합니다.
+
+        Args:
+            samples: (n, D) 학습용 임베딩 (n >= num_centroids)
+            iterations: k-means 반복 횟수
+            seed: 재현 가능한 학습을 위한 시드
+
+        Returns:
+            학습된 자기 자신
+        """
+        if len(samples) < self.num_centroids:
+            raise ValueError(
+                f"학습 샘플은 최소 {self.num_centroids}개 이상이어야 합니다 (입력: {len(samples)})"
+            )
+
+        rng = np.random.default_rng(seed)
+        subspaces = self._split(samples)
+        self.codebooks = np.stack(
+            [_kmeans(sub, self.num_centroids, iterations, rng) for sub in subspaces]
+        ).astype(np.float32)
+
+        logger.info(
+            f"PQ 코드북 학습 완료 (samples: {len(samples)}, M: {self.num_subvectors}, K: {self.num_centroids})"
+        )
+        return self
+
+    def _require_trained(self) -> np.ndarray:
+        if self.codebooks is None:
+            raise RuntimeError("PQ 코드북이 학습되지 않았습니다")
+        return self.codebooks
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """벡터를 (n, M) uint8 코드로 인코딩합니다."""
+        codebooks = self._require_trained()
+        subspaces = self._split(vectors)
+
+        codes = np.empty((subspaces.shape[1], self.num_subvectors), dtype=np.uint8)
+        for m, (sub, codebook) in enumerate(zip(subspaces, codebooks)):
+            distances = -2.0 * sub @ codebook.T + (codebook**2).sum(axis=1)
+            codes[:, m] = distances.argmin(axis=1)
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """코드를 근사 벡터 (n, D)로 복원합니다."""
+        codebooks = self._require_trained()
+        codes = np.atleast_2d(codes)
+        parts = codebooks[np.arange(self.num_subvectors), codes]  # (n, M, D/M)
+        return parts.reshape(len(codes), self.dimension)
+
+    def lookup_table(self, query: np.ndarray) -> np.ndarray:
+        """
+        비대칭 거리 계산(ADC)용 룩업 테이블을 만듭니다.
+
+        쿼리는 압축하지 않은 채로 두고, 서브스페이스별로 쿼리 서브벡터와
+        모든 중심점의 내적을 미리 계산합니다. 코드 하나의 점수는 M번의 테이블 조회 합입니다.
+
+        Returns:
+            (M, K) 내적 테이블
+        """
+        codebooks = self._require_trained()
+        query_subs = self._split(query)[:, 0, :]  # (M, D/M)
+        return np.einsum("mkd,md->mk", codebooks, query_subs)
+
+    def score(self, table: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """룩업 테이블로 코드들의 근사 코사인 유사도를 계산합니다."""
+        scores = np.empty(len(codes), dtype=np.float32)
+        subvector_index = np.arange(self.num_subvectors)
+        for start in range(0, len(codes), _SCORE_CHUNK_SIZE):
+            chunk = codes[start : start + _SCORE_CHUNK_SIZE]
+            scores[start : start + len(chunk)] = table[subvector_index, chunk].sum(axis=1)
+        return scores
+
+    def save(self, path: Path) -> None:
+        codebooks = self._require_trained()
+        np.savez(
+            path,
+            codebooks=codebooks,
+            dimension=self.dimension,
+            num_subvectors=self.num_subvectors,
+            num_centroids=self.num_centroids,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "ProductQuantizer":
+        with np.load(path) as data:
+            quantizer = cls(
+                dimension=int(data["dimension"]),
+                num_subvectors=int(data["num_subvectors"]),
+                num_centroids=int(data["num_centroids"]),
+            )
+            quantizer.codebooks = data["codebooks"].astype(np.float32)
+        return quantizer
+
+
+class PQIndex:
+    """
+    PQ 코드 기반 인메모리 검색 인덱스
+
+    메모리에는 리포트당 M 바이트 코드만 유지하고, 원본 float32 벡터는
+    디스크 파일(vectors_path)에 추가 기록해 상위 후보의 정밀 재정렬에만 사용합니다.
+    vectors_path는 인덱스 전용 파일이며 새 인덱스를 만들면 비웁니다.
+
+    디렉터리 구성:
+        codebook.npz  - 학습된 PQ 코드북
+        codes.npy     - (n, M) uint8 코드
+        ids.npy       - (n,) report_id
+        vectors.f32   - (n, D) 원본 벡터 (선택, 재정렬용)
+    """
+
+    def __init__(
+        self,
+        quantizer: ProductQuantizer,
+        vectors_path: Path | None = None,
+    ):
+        self.quantizer = quantizer
+        self.vectors_path = vectors_path
+        self._codes = np.empty((0, quantizer.num_subvectors), dtype=np.uint8)
+        self._report_ids = np.empty(0, dtype=np.int64)
+        self._vectors: np.memmap | None = None
+        if vectors_path is not None:
+            # 기존 파일에 이어 쓰면 행 번호가 코드와 어긋나므로 새 인덱스는 빈 파일에서 시작
+            vectors_path.write_bytes(b"")
+
+    def __len__(self) -> int:
+        return len(self._report_ids)
+
+    @property
+    def memory_bytes(self) -> int:
+        """코드와 ID가 차지하는 메모리 (재정렬용 디스크 벡터 제외)"""
+        return self._codes.nbytes + self._report_ids.nbytes
+
+    def add(self, report_ids: list[int] | np.ndarray, vectors: np.ndarray) -> None:
+        """벡터를 인코딩해 인덱스에 추가합니다."""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        report_ids = np.asarray(report_ids, dtype=np.int64)
+        if len(report_ids) != len(vectors):
+            raise ValueError("report_ids와 vectors의 개수가 같아야 합니다")
+
+        self._codes = np.concatenate([self._codes, self.quantizer.encode(vectors)])
+        self._report_ids = np.concatenate([self._report_ids, report_ids])
+
+        if self.vectors_path is not None:
+            with open(self.vectors_path, "ab") as f:
+                f.write(_normalize(vectors).astype("<f4").tobytes())
+            # 파일 크기가 바뀌었으므로 다음 재정렬 시 memmap을 다시 연다
+            self._vectors = None
+
+    def _full_vectors(self) -> np.memmap | None:
+        if self.vectors_path is None or not self.vectors_path.exists():
+            return None
+        expected_bytes = len(self) * self.quantizer.dimension * 4
+        if self.vectors_path.stat().st_size != expected_bytes:
+            logger.warning(
+                f"재정렬용 벡터 파일 크기가 인덱스와 다릅니다 ({self.vectors_path}), 재정렬 생략"
+            )
+            return None
+        if self._vectors is None:
+            self._vectors = np.memmap(
+                self.vectors_path,
+                dtype="<f4",
+                mode="r",
+                shape=(len(self), self.quantizer.dimension),
+            )
+        return self._vectors
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 10,
+        rerank_candidates: int = 0,
+    ) -> list[tuple[int, float]]:
+        """
+        근사 코사인 유사도 상위 k개를 반환합니다.
+
+        Args:
+            query: (D,) 쿼리 벡터
+            k: 반환할 결과 수
+            rerank_candidates: 0보다 크면 PQ 점수 상위 후보를 디스크 원본 벡터로 정밀 재정렬
+
+        Returns:
+            (report_id, similarity) 목록 (유사도 내림차순)
+        """
+        if len(self) == 0:
+            return []
+
+        table = self.quantizer.lookup_table(query)
+        scores = self.quantizer.score(table, self._codes)
+
+        full_vectors = self._full_vectors() if rerank_candidates > 0 else None
+        num_candidates = max(k, rerank_candidates) if full_vectors is not None else k
+        num_candidates = min(num_candidates, len(self))
+
+        candidates = np.argpartition(-scores, num_candidates - 1)[:num_candidates]
+
+        if full_vectors is not None:
+            query_vector = _normalize(np.asarray(query, dtype=np.float32)[None, :])[0]
+            candidates.sort()  # memmap 순차 접근
+            scores_exact = full_vectors[candidates] @ query_vector
+            order = np.argsort(-scores_exact)[:k]
+            return [
+                (int(self._report_ids[candidates[i]]), float(scores_exact[i]))
+                for i in order
+            ]
+
+        order = candidates[np.argsort(-scores[candidates])][:k]
+        return [(int(self._report_ids[i]), float(scores[i])) for i in order]
+
+    def save(self, directory: Path) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.quantizer.save(directory / "codebook.npz")
+        np.save(directory / "codes.npy", self._codes)
+        np.save(directory / "ids.npy", self._report_ids)
+
+        # 재정렬용 벡터는 항상 directory/vectors.f32 에 둠 (다른 경로면 복사)
+        target = directory / "vectors.f32"
+        if self.vectors_path is not None and self.vectors_path.exists():
+            if self.vectors_path.resolve() != target.resolve():
+                shutil.copyfile(self.vectors_path, target)
+        elif target.exists():
+            # 이전 저장본의 벡터가 남아 있으면 다른 인덱스로 재정렬하게 되므로 삭제
+            target.unlink()
+
+    @classmethod
+    def load(cls, directory: Path) -> "PQIndex":
+        quantizer = ProductQuantizer.load(directory / "codebook.npz")
+        # 생성자는 vectors_path를 비우므로 로드 후에 연결
+        index = cls(quantizer)
+        index._codes = np.load(directory / "codes.npy")
+        index._report_ids = np.load(directory / "ids.npy")
+        if (directory / "vectors.f32").exists():
+            index.vectors_path = directory / "vectors.f32"
+        logger.info(
+            f"PQ 인덱스 로드 완료 (vectors: {len(index)}, memory: {index.memory_bytes / 1024 / 1024:.1f}MB)"
+        )
+        return index
@@ -0,0 +1,163 @@
+import logging
+
+import numpy as np
+
+from app.core.exceptions import ErrorCode, ServiceUnavailableException
+from app.services.circuit_breaker import CircuitBreaker, CircuitState
+from app.services.embedding_cache import EmbeddingCache
+from app.services.embedding_service import EmbeddingResult, EmbeddingService
+from app.services.near_duplicate import NearDuplicate, NearDuplicateIndex
+from app.services.priority_scheduler import (
+    Priority,
+    PriorityScheduler,
+    estimate_tokens,
+)
+from app.utils.text_processor import text_digest
+
+logger = logging.getLogger(__name__)
+
+
+class ResilientEmbeddingService:
+    """
+    서킷 브레이커 + 캐시 + 대체 백엔드로 감싼 EmbeddingService
+
+    - 캐시에 있으면 OpenAI를 호출하지 않습니다.
+    - OpenAI 오류율이 높아지면 서킷을 열어 재시도 대기 없이 즉시 캐시/대체 백엔드로 응답하고,
+      이때 응답은 degraded로 표시됩니다.
+    - 캐시에도 없고 대체 백엔드도 없으면 503(CIRCUIT_OPEN)으로 빠르게 실패합니다.
+    - OpenAI 호출은 PriorityScheduler로 interactive/bulk 레인을 나눠 실행합니다.
+    - near_duplicates가 있으면 캐시에 없는 텍스트의 근접 중복을 찾아 표시하고,
+      reuse_near_duplicates면 근접 중복의 캐시된 임베딩을 재사용합니다.
+    """
+
+    def __init__(
+        self,
+        primary: EmbeddingService,
+        breaker: CircuitBreaker,
+        cache: EmbeddingCache,
+        fallback: EmbeddingService | None = None,
+        scheduler: PriorityScheduler | None = None,
+        near_duplicates: NearDuplicateIndex | None = None,
+        reuse_near_duplicates: bool = False,
+    ):
+        self.primary = primary
+        self.breaker = breaker
+        self.cache = cache
+        self.fallback = fallback
+        self.scheduler = scheduler
+        self.near_duplicates = near_duplicates
+        self.reuse_near_duplicates = reuse_near_duplicates
+
+    @property
+    def model(self) -> str:
+        return self.primary.model
+
+    @property
+    def dimension(self) -> int:
+        return self.primary.dimension
+
+    def is_upstream_error(self, error: Exception) -> bool:
+        return self.primary.is_upstream_error(error)
+
+    def is_outage_error(self, error: Exception) -> bool:
+        return self.primary.is_outage_error(error)
+
+    async def embed(
+        self, text: str, priority: Priority = Priority.INTERACTIVE
+    ) -> EmbeddingResult:
+        return (await self.embed_many([text], priority))[0]
+
+    async def embed_many(
+        self, texts: list[str], priority: Priority = Priority.INTERACTIVE
+    ) -> list[EmbeddingResult]:
+        """
+        캐시에 없는 텍스트만 모아 한 번에 임베딩합니다. (입력 순서 유지)
+
+        스케줄러가 있으면 priority 레인의 슬롯/토큰을 확보한 뒤 OpenAI를 호출합니다.
+        """
+        degraded = self.breaker.state != CircuitState.CLOSED
+        results: list[EmbeddingResult | None] = []
+        for text in texts:
+            digest = text_digest(text)
+            vector = self.cache.get(self.model, digest)
+            results.append(
+                EmbeddingResult(vector, self.model, digest, degraded=degraded)
+                if vector is not None
+                else None
+            )
+
+        missing = [i for i, result in enumerate(results) if result is None]
+        matches: dict[int, tuple[NearDuplicate | None, np.ndarray]] = {}
+        if self.near_duplicates is not None:
+            for i in missing:
+                signature = self.near_duplicates.signature(texts[i])
+                match = self.near_duplicates.query(signature)
+                matches[i] = (match, signature)
+                vector = (
+                    self.cache.get(self.model, match.key)
+                    if match is not None and self.reuse_near_duplicates
+                    else None
+                )
+                if vector is not None:
+                    # 다른 텍스트의 벡터이므로 이 텍스트의 다이제스트로 캐시/저장하지 않고,
+                    # text_digest도 벡터를 만든 원본 텍스트의 것으로 둠 (마이그레이션 시 재임베딩 대상)
+                    match.reused = True
+                    results[i] = EmbeddingResult(vector, self.model, match.key, degraded=degraded)
+            missing = [i for i in missing if results[i] is None]
+
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            for i, result in zip(missing, await self._embed_uncached(missing_texts, priority)):
+                results[i] = result
+
+        # 대체 백엔드 벡터는 다른 벡터 공간이므로 인덱스에 등록하지 않음
+        # 재사용한 텍스트도 원본 텍스트가 대표하므로 등록하지 않음 (다시 들어와도 원본 벡터를 재사용)
+        for i, (match, signature) in matches.items():
+            results[i].near_duplicate = match
+            if results[i].model == self.model and not (match is not None and match.reused):
+                self.near_duplicates.add(
+                    results[i].text_digest, signature, duplicate_of=match.key if match else None
+                )
+        return results
+
+    async def _embed_uncached(
+        self, texts: list[str], priority: Priority
+    ) -> list[EmbeddingResult]:
+        if not self.breaker.allow_request():
+            return await self._degraded(texts)
+
+        try:
+            if self.scheduler is None:
+                results = await self.primary.embed_many(texts)
+            else:
+                tokens = sum(estimate_tokens(text) for text in texts)
+                async with self.scheduler.slot(priority, tokens):
+                    results = await self.primary.embed_many(texts)
+        except Exception as e:
+            if not self.is_outage_error(e):
+                # 잘못된 요청(4xx) 등은 장애가 아니므로 실패로 세지 않고 시험 슬롯만 반납
+                self.breaker.release()
+                raise
+            self.breaker.record_failure()
+            if self.fallback is None:
+                raise
+            logger.warning(f"OpenAI 호출 실패, 대체 백엔드로 응답: {e}")
+            return await self._degraded(texts)
+        except BaseException:
+            # 취소 등으로 결과 없이 끝나면 HALF_OPEN 시험 슬롯만 반납
+            self.breaker.release()
+            raise
+
+        self.breaker.record_success()
+        for result in results:
+            self.cache.put(result.model, result.text_digest, result.vector)
+        return results
+
+    async def _degraded(self, texts: list[str]) -> list[EmbeddingResult]:
+        if self.fallback is None:
+            raise ServiceUnavailableException(ErrorCode.CIRCUIT_OPEN)
+
+        results = await self.fallback.embed_many(texts)
+        for result in results:
+            result.degraded = True
+        return results
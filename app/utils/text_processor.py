@@ -1,4 +1,14 @@
-from typing import Any
+import hashlib
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import IO, Any
+
+import orjson
+
+# 워커 프로세스 하나에 한 번에 넘길 리포트 수
+BULK_CHUNK_SIZE = 1000
 
 
 def extract_embedding_text(report: dict[str, Any]) -> str:
@@ -35,3 +45,77 @@ def extract_embedding_text(report: dict[str, Any]) -> str:
             parts.append(title)
 
     return "\n".join(parts)
+
+
+def text_digest(text: str) -> str:
+    """
+    임베딩 입력 텍스트의 SHA-256 다이제스트를 반환합니다.
+
+    같은 모델에서 다이제스트가 같으면 벡터도 같으므로 재임베딩을 건너뛸 수 있습니다.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def iter_ndjson_lines(source: bytes | IO[bytes] | Iterable[bytes]) -> Iterator[bytes]:
+    """NDJSON 바이트 버퍼/스트림에서 비어 있지 않은 줄을 반환합니다."""
+    lines = source.split(b"\n") if isinstance(source, bytes) else source
+    for line in lines:
+        if line.strip():
+            yield line
+
+
+def _extract_one(report: dict[str, Any]) -> tuple[str, str]:
+    text = extract_embedding_text(report)
+    return text, text_digest(text)
+
+
+def _extract_chunk(chunk: list[dict[str, Any]] | list[bytes]) -> list[tuple[str, str]]:
+    """워커 프로세스에서 실행. NDJSON 줄이면 파싱까지 워커에서 처리합니다."""
+    return [
+        _extract_one(orjson.loads(item) if isinstance(item, bytes) else item)
+        for item in chunk
+    ]
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def extract_embedding_texts(
+    reports: Iterable[dict[str, Any]] | bytes | IO[bytes],
+    workers: int = 0,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> Iterator[tuple[str, str]]:
+    """
+    리포트 여러 개에서 임베딩 텍스트와 다이제스트를 추출합니다. (백필/배치용)
+
+    Args:
+        reports: 리포트 dict 이터러블, 또는 NDJSON 바이트 버퍼/바이너리 스트림
+        workers: 1 이상이면 프로세스 풀로 분산 (NDJSON 파싱도 워커에서 수행)
+        chunk_size: 워커에 한 번에 넘길 리포트 수
+
+    Yields:
+        (text, text_digest) - 입력 순서 유지
+    """
+    items = (
+        iter_ndjson_lines(reports)
+        if isinstance(reports, bytes) or hasattr(reports, "read")
+        else reports
+    )
+
+    if workers <= 0:
+        for chunk in _chunked(items, chunk_size):
+            yield from _extract_chunk(chunk)
+        return
+
+    # 입력 전체를 한꺼번에 제출하지 않도록 진행 중인 청크 수를 제한
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight: deque[Future] = deque()
+        for chunk in _chunked(items, chunk_size):
+            in_flight.append(executor.submit(_extract_chunk, chunk))
+            if len(in_flight) >= workers * 2:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
@@ -0,0 +1,31 @@
+import base64
+
+import numpy as np
+
+
+def as_vector(values: np.ndarray | list[float]) -> np.ndarray:
+    """
+    float32 연속 배열로 변환합니다. (이미 float32 배열이면 복사하지 않음)
+
+    캐시/인덱스/저장소가 같은 버퍼를 참조로 공유하므로 읽기 전용으로 표시합니다.
+    """
+    vector = np.ascontiguousarray(values, dtype=np.float32)
+    vector.flags.writeable = False
+    return vector
+
+
+def decode_embedding(data: str | list[float]) -> np.ndarray:
+    """
+    OpenAI 응답의 embedding 필드를 float32 배열로 변환합니다.
+
+    encoding_format="base64"면 little-endian float32 바이트이므로 그대로 버퍼로 사용하고,
+    base64를 지원하지 않는 OpenAI 호환 서버가 float 목록을 보내면 한 번만 변환합니다.
+    """
+    if isinstance(data, str):
+        return as_vector(np.frombuffer(base64.b64decode(data), dtype="<f4"))
+    return as_vector(data)
+
+
+def encode_base64(vector: np.ndarray | list[float]) -> str:
+    """OpenAI encoding_format="base64"와 같은 형식 (little-endian float32)"""
+    return base64.b64encode(np.asarray(vector, dtype="<f4").tobytes()).decode("ascii")
@@ -1,13 +1,35 @@
 -- pgvector 확장 활성화
 CREATE EXTENSION IF NOT EXISTS vector;
 
+-- 임베딩 모델 버전 (검색 대상은 is_live인 모델 하나)
+CREATE TABLE IF NOT EXISTS embedding_models (
+    model VARCHAR(100) PRIMARY KEY,
+    dimension INT NOT NULL,
+    is_live BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- live 모델은 최대 하나
+CREATE UNIQUE INDEX IF NOT EXISTS idx_embedding_models_live
+ON embedding_models (is_live)
+WHERE is_live;
+
+INSERT INTO embedding_models (model, dimension, is_live)
+VALUES ('text-embedding-3-small', 1536, TRUE)
+ON CONFLICT (model) DO NOTHING;
+
 -- 임베딩 테이블 생성
+-- 리포트당 모델별로 한 행 (모델 마이그레이션 중에는 구/신 벡터가 나란히 존재)
 CREATE TABLE IF NOT EXISTS report_embeddings (
     id BIGSERIAL PRIMARY KEY,
     report_id BIGINT NOT NULL,
+    model VARCHAR(100) NOT NULL REFERENCES embedding_models (model),
+    dimension INT NOT NULL,
+    text_digest VARCHAR(64),  -- 임베딩 입력 텍스트 SHA-256
     report_title VARCHAR(500),
     embedding vector(1536),
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (report_id, model)  -- 재임베딩 시 upsert (ON CONFLICT (report_id, model))
 );
 
 -- 코사인 유사도 검색을 위한 인덱스 (IVFFlat)
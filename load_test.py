@@ -0,0 +1,416 @@
+"""
+임베딩 → 저장 → 검색 부하 테스트 (FastAPI 단일 인스턴스 처리량 한계 측정)
+
+외부 서버 없이 프로세스 안에서 FastAPI 앱을 띄우고 다음을 대체합니다.
+- OpenAI: 지연 시간만 흉내 내는 가짜 클라이언트 (텍스트별로 같은 벡터 반환)
+- 벡터 저장소: 임시 SQLite 파일 (시작 시 corpus-size개 벡터로 채움)
+
+서킷 브레이커, 캐시, 우선순위 스케줄러, write-behind, 클러스터 인덱스는 실제 코드 그대로 동작합니다.
+
+시나리오별로 동시 사용자 수를 단계적으로 올리며 작업 종류별 지연 히스토그램과
+처리량이 더 이상 늘지 않는 포화 지점을 기록합니다.
+
+실행 방법:
+    python load_test.py
+    python load_test.py --scenario burst --duration 10
+    python load_test.py --stages 1,4,16,64,256 --openai-latency-ms 150 --output result.json
+
+참고:
+- 부하 생성기와 서버가 같은 이벤트 루프를 쓰므로 측정값에는 클라이언트 비용이 포함됩니다.
+  (실제 서버 한계는 이보다 약간 높음)
+- 스케줄러/토큰 한도(SCHEDULER_*, OPENAI_TOKENS_PER_MINUTE)는 .env 값을 그대로 사용하므로
+  운영 설정 기준의 한계를 측정합니다.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+
+from app.utils.vector_codec import encode_base64
+from test_100_reports import generate_report
+
+DIMENSION = 1536
+
+# 시나리오: 작업 비율과 단계별 동시 사용자 수
+SCENARIOS = {
+    # 평상시 혼합 트래픽
+    "mixed": {
+        "weights": {"embed": 0.3, "save": 0.3, "search": 0.3, "duplicate_save": 0.1},
+        "stages": [1, 2, 4, 8, 16, 32, 64, 128],
+    },
+    # 백필 등으로 저장이 몰리는 경우
+    "write_heavy": {
+        "weights": {"save": 0.6, "duplicate_save": 0.3, "search": 0.1},
+        "stages": [1, 4, 16, 64, 128],
+    },
+    "search_heavy": {
+        "weights": {"search": 0.8, "embed": 0.2},
+        "stages": [1, 4, 16, 64, 128],
+    },
+    # 평상시 → 순간 폭주 → 평상시 (폭주 후 지연이 회복되는지 확인)
+    "burst": {
+        "weights": {"embed": 0.3, "save": 0.3, "search": 0.3, "duplicate_save": 0.1},
+        "stages": [8, 256, 8],
+    },
+}
+
+
+# === 가짜 OpenAI / 저장소 ===
+
+
+def fake_vector(text: str) -> np.ndarray:
+    """텍스트별로 항상 같은 단위 벡터"""
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(DIMENSION).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class FakeEmbeddings:
+    """`client.embeddings.create()` 대체. 지연은 로그정규분포 (긴 꼬리 흉내)"""
+
+    def __init__(self, latency_ms: float):
+        self.latency_ms = latency_ms
+        self.calls = 0
+
+    async def create(self, model: str, input: list[str], encoding_format: str = "float", **kwargs):
+        self.calls += 1
+        if self.latency_ms > 0:
+            await asyncio.sleep(random.lognormvariate(math.log(self.latency_ms), 0.3) / 1000)
+        encode = encode_base64 if encoding_format == "base64" else lambda vector: vector.tolist()
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=index, embedding=encode(fake_vector(text)))
+                for index, text in enumerate(input)
+            ]
+        )
+
+
+class FakeOpenAIClient:
+    def __init__(self, latency_ms: float):
+        self.embeddings = FakeEmbeddings(latency_ms)
+
+
+async def seed_vector_store(url: str, model: str, corpus_size: int) -> None:
+    """검색 대상 코퍼스를 미리 채웁니다. (클러스터 인덱스는 시작 시 이 벡터로 학습)"""
+    from app.services.vector_store import EmbeddingRecord, create_vector_store
+
+    store = create_vector_store(url)
+    await store.open()
+    await store.register_model(model, DIMENSION)
+    await store.activate_model(model)
+
+    rng = np.random.default_rng(0)
+    for start in range(0, corpus_size, 1000):
+        count = min(1000, corpus_size - start)
+        vectors = rng.standard_normal((count, DIMENSION)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        await store.upsert_many(
+            [
+                EmbeddingRecord(
+                    report_id=start + i + 1,
+                    embedding=vector,
+                    model=model,
+                    text_digest="0" * 64,
+                    report_title=f"seed-{start + i + 1}",
+                )
+                for i, vector in enumerate(vectors)
+            ]
+        )
+    await store.close()
+
+
+# === 측정 ===
+
+
+class LatencyHistogram:
+    """작업별 지연 기록 (백분위는 원본 샘플로 정확히 계산, 출력은 2배 간격 버킷)"""
+
+    def __init__(self):
+        self.samples: list[float] = []
+        self.errors = 0
+
+    def record(self, latency_ms: float) -> None:
+        self.samples.append(latency_ms)
+
+    def percentile(self, p: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def buckets(self) -> list[tuple[float, int]]:
+        """(버킷 상한 ms, 개수) 목록: 1, 2, 4, 8, ... ms"""
+        counts: dict[float, int] = defaultdict(int)
+        for latency in self.samples:
+            counts[2.0 ** max(0, math.ceil(math.log2(max(latency, 1e-3))))] += 1
+        return sorted(counts.items())
+
+    def summary(self) -> dict:
+        return {
+            "count": len(self.samples),
+            "errors": self.errors,
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "max_ms": round(max(self.samples, default=0.0), 2),
+        }
+
+
+@dataclass
+class StageResult:
+    concurrency: int
+    duration: float
+    histograms: dict[str, LatencyHistogram] = field(default_factory=lambda: defaultdict(LatencyHistogram))
+
+    @property
+    def completed(self) -> int:
+        return sum(len(h.samples) for h in self.histograms.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(h.errors for h in self.histograms.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.completed / self.duration if self.duration else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "throughput_rps": round(self.throughput, 1),
+            "errors": self.errors,
+            "operations": {op: h.summary() for op, h in self.histograms.items()},
+        }
+
+
+def find_saturation(stages: list[StageResult], min_gain: float = 0.1) -> dict:
+    """
+    동시 사용자를 늘려도 처리량이 min_gain(10%) 이상 늘지 않는 첫 단계를 포화 지점으로 봅니다.
+
+    Returns:
+        ceiling_rps: 관측된 최대 처리량
+        saturated_at: 포화가 시작된 동시 사용자 수 (끝까지 늘었으면 None)
+    """
+    ceiling = max(stages, key=lambda stage: stage.throughput)
+    saturated_at = None
+    for previous, current in zip(stages, stages[1:]):
+        if current.concurrency > previous.concurrency and current.throughput < previous.throughput * (1 + min_gain):
+            saturated_at = previous.concurrency
+            break
+    return {
+        "ceiling_rps": round(ceiling.throughput, 1),
+        "ceiling_concurrency": ceiling.concurrency,
+        "saturated_at": saturated_at,
+    }
+
+
+# === 부하 생성 ===
+
+
+class Workload:
+    """작업 종류별 요청 생성 (저장된 report_id를 기억해 중복 저장에 재사용)"""
+
+    def __init__(self, client: httpx.AsyncClient, first_report_id: int):
+        self.client = client
+        self._next_report_id = first_report_id
+        self._saved: list[tuple[int, str, dict]] = []
+        self._sequence = 0
+
+    def _new_report(self) -> tuple[str, dict]:
+        # generate_report 조합은 유한하므로 일련번호를 붙여 캐시 적중을 피함
+        self._sequence += 1
+        title, report = generate_report(random.randrange(1000))
+        report["overview"]["summary"] += f" (#{self._sequence})"
+        return title, report
+
+    async def embed(self) -> httpx.Response:
+        _, report = self._new_report()
+        return await self.client.post("/embed", json={"report": report})
+
+    async def save(self) -> httpx.Response:
+        title, report = self._new_report()
+        report_id = self._next_report_id
+        self._next_report_id += 1
+        response = await self.client.post(
+            "/embed",
+            json={"report": report, "report_id": report_id, "report_title": title},
+        )
+        if response.status_code == 200:
+            self._saved.append((report_id, title, report))
+        return response
+
+    async def duplicate_save(self) -> httpx.Response:
+        # 같은 리포트 재저장 (캐시 적중 + write-behind 병합 경로)
+        if not self._saved:
+            return await self.save()
+        report_id, title, report = random.choice(self._saved)
+        return await self.client.post(
+            "/embed",
+            json={"report": report, "report_id": report_id, "report_title": title},
+        )
+
+    async def search(self) -> httpx.Response:
+        _, report = self._new_report()
+        return await self.client.post("/search", json={"report": report, "limit": 10})
+
+
+async def run_stage(
+    workload: Workload,
+    weights: dict[str, float],
+    concurrency: int,
+    duration: float,
+) -> StageResult:
+    """concurrency명의 사용자가 duration초 동안 쉬지 않고 요청합니다. (closed loop)"""
+    operations = list(weights)
+    probabilities = [weights[op] for op in operations]
+    result = StageResult(concurrency=concurrency, duration=duration)
+    deadline = time.perf_counter() + duration
+
+    async def user() -> None:
+        while time.perf_counter() < deadline:
+            op = random.choices(operations, probabilities)[0]
+            start = time.perf_counter()
+            try:
+                response = await getattr(workload, op)()
+                ok = response.status_code == 200
+            except Exception:
+                ok = False
+            if ok:
+                result.histograms[op].record((time.perf_counter() - start) * 1000)
+            else:
+                result.histograms[op].errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    # 마지막 요청이 deadline을 넘겨 끝날 수 있으므로 실제 경과 시간 기준
+    result.duration = time.perf_counter() - started
+    return result
+
+
+def print_stage(stage: StageResult) -> None:
+    print(f"\n[동시 사용자 {stage.concurrency:4d}] 처리량 {stage.throughput:8.1f} req/s, 오류 {stage.errors}")
+    for op, histogram in sorted(stage.histograms.items()):
+        s = histogram.summary()
+        print(
+            f"  {op:15s} n={s['count']:6d}  p50 {s['p50_ms']:8.1f}ms  "
+            f"p95 {s['p95_ms']:8.1f}ms  p99 {s['p99_ms']:8.1f}ms  max {s['max_ms']:8.1f}ms"
+        )
+
+
+def print_histogram(op: str, histogram: LatencyHistogram, width: int = 40) -> None:
+    buckets = histogram.buckets()
+    if not buckets:
+        return
+    peak = max(count for _, count in buckets)
+    print(f"\n  {op}")
+    for upper, count in buckets:
+        bar = "#" * max(1, round(count / peak * width))
+        print(f"    <= {upper:7.0f}ms | {bar} {count}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="FastAPI 임베딩 서버 부하 테스트")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--stages", help="동시 사용자 단계 (예: 1,4,16,64). 비우면 시나리오 기본값")
+    parser.add_argument("--duration", type=float, default=5.0, help="단계별 측정 시간(초)")
+    parser.add_argument("--openai-latency-ms", type=float, default=80.0, help="가짜 OpenAI 응답 지연 중앙값")
+    parser.add_argument("--corpus-size", type=int, default=5000, help="검색 대상 사전 적재 벡터 수")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    scenario = SCENARIOS[args.scenario]
+    stages = [int(s) for s in args.stages.split(",")] if args.stages else scenario["stages"]
+
+    workdir = tempfile.mkdtemp(prefix="devine-load-")
+    store_url = f"sqlite:///{workdir}/vectors.db"
+
+    # .env보다 우선: 외부 서비스 대신 로컬 대체물 사용
+    os.environ["OPENAI_API_KEY"] = "load-test"
+    os.environ["VECTOR_STORE_URL"] = store_url
+    os.environ["CLUSTER_INDEX_ENABLED"] = "true"
+    os.environ["FALLBACK_EMBEDDING_BASE_URL"] = ""
+    # 요청마다 남는 INFO 로그가 측정을 왜곡하지 않도록
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from app.core.config import get_settings
+    from app.main import app
+
+    settings = get_settings()
+
+    print("=" * 70)
+    print(f"부하 테스트 - 시나리오: {args.scenario}, 단계: {stages}, 단계별 {args.duration}초")
+    print(
+        f"가짜 OpenAI 지연 {args.openai_latency_ms}ms, 코퍼스 {args.corpus_size}건, "
+        f"동시 OpenAI 호출 {settings.SCHEDULER_MAX_CONCURRENCY}, "
+        f"분당 토큰 {settings.OPENAI_TOKENS_PER_MINUTE}"
+    )
+    print("=" * 70)
+
+    await seed_vector_store(store_url, settings.EMBEDDING_MODEL, args.corpus_size)
+
+    results: list[StageResult] = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=60.0) as client:
+            while (await client.get("/ready")).status_code != 200:
+                await asyncio.sleep(0.05)
+            fake_client = FakeOpenAIClient(args.openai_latency_ms)
+            app.state.embedding_service.primary._client = fake_client
+
+            workload = Workload(client, first_report_id=args.corpus_size + 1)
+            for concurrency in stages:
+                stage = await run_stage(workload, scenario["weights"], concurrency, args.duration)
+                results.append(stage)
+                print_stage(stage)
+
+            await app.state.write_behind.flush()
+
+    saturation = find_saturation(results)
+    peak = max(results, key=lambda stage: stage.throughput)
+
+    print("\n" + "-" * 70)
+    print(f"최대 처리량 단계(동시 사용자 {peak.concurrency}) 지연 히스토그램")
+    print("-" * 70)
+    for op, histogram in sorted(peak.histograms.items()):
+        print_histogram(op, histogram)
+
+    print("\n" + "=" * 70)
+    print(f"처리량 한계: {saturation['ceiling_rps']} req/s (동시 사용자 {saturation['ceiling_concurrency']})")
+    if saturation["saturated_at"] is not None:
+        print(f"포화 지점: 동시 사용자 {saturation['saturated_at']} 이후 처리량이 더 늘지 않음")
+    else:
+        print("포화 지점: 측정 범위 안에서 포화되지 않음 (--stages로 더 높여 보세요)")
+    print(f"가짜 OpenAI 호출 수: {fake_client.embeddings.calls}")
+    print("=" * 70)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "scenario": args.scenario,
+                    "openai_latency_ms": args.openai_latency_ms,
+                    "corpus_size": args.corpus_size,
+                    "stages": [stage.to_dict() for stage in results],
+                    "saturation": saturation,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        print(f"결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
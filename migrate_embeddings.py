@@ -0,0 +1,96 @@
+"""
+임베딩 모델 마이그레이션 실행 스크립트
+
+VECTOR_STORE_URL 저장소에 대상 모델 벡터를 기존 벡터 옆에 채운 뒤,
+커버리지를 확인하고 검색 대상(live) 모델을 전환합니다.
+
+입력은 NDJSON이며 한 줄에 리포트 하나입니다. (Spring DB에서 내보낸 리포트)
+    {"report_id": 1, "report_title": "...", "report": {...}}
+
+실행 방법:
+    # 1. 재임베딩 (검색은 기존 모델 유지, 중단 후 다시 실행하면 다이제스트가 같은 리포트는 건너뜀)
+    python migrate_embeddings.py --model text-embedding-3-large --input reports.ndjson
+
+    # 2. 커버리지 확인 후 전환 (재임베딩과 함께 하려면 --input과 --switch를 같이 지정)
+    python migrate_embeddings.py --model text-embedding-3-large --switch --min-coverage 0.99
+
+참고:
+- report_embeddings.embedding 컬럼이 vector(1536)이므로 대상 모델도 같은 차원으로 출력해야 합니다.
+  text-embedding-3 계열은 dimensions=EMBEDDING_DIMENSION으로 요청하고, 그 외 모델은 차원이 다르면 시작 전에 중단합니다.
+- AI 서버는 워밍업 시 live 모델을 읽어 그 모델로 임베딩하므로, 전환 후 서버를 순차 재시작합니다.
+  (재시작 전까지 들어온 리포트는 기존 모델로 저장되므로 재시작 후 1단계를 다시 실행해 채움)
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+
+from app.core.config import get_settings
+from app.services.embedding_migration import EmbeddingMigration, read_report_sources
+from app.services.embedding_service import EmbeddingService
+from app.services.vector_store import create_vector_store
+
+logger = logging.getLogger("migrate_embeddings")
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="임베딩 모델 마이그레이션")
+    parser.add_argument("--model", required=True, help="대상 임베딩 모델")
+    parser.add_argument("--input", help="리포트 NDJSON 파일 (생략하면 재임베딩 없이 전환만)")
+    parser.add_argument("--switch", action="store_true", help="커버리지 확인 후 live 모델 전환")
+    parser.add_argument("--min-coverage", type=float, default=1.0, help="전환에 필요한 최소 커버리지")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 처리할 배치 수")
+    args = parser.parse_args()
+
+    if not args.input and not args.switch:
+        parser.error("--input 또는 --switch 중 하나는 지정해야 합니다")
+
+    settings = get_settings()
+    logging.basicConfig(
+        level=getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    if not settings.VECTOR_STORE_URL:
+        logger.error("VECTOR_STORE_URL이 설정되지 않았습니다")
+        return 1
+
+    store = create_vector_store(
+        settings.VECTOR_STORE_URL,
+        connect_timeout=settings.VECTOR_STORE_CONNECT_TIMEOUT,
+        command_timeout=settings.VECTOR_STORE_COMMAND_TIMEOUT,
+    )
+    await store.open()
+    try:
+        migration = EmbeddingMigration(
+            store,
+            EmbeddingService(model=args.model),
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+        )
+
+        if args.input:
+            try:
+                with open(args.input, "rb") as f:
+                    progress = await migration.run(read_report_sources(f))
+            except ValueError as e:
+                logger.error(f"재임베딩 중단: {e}")
+                return 1
+            if progress.failed:
+                logger.error(f"재임베딩 실패 {progress.failed}건, 다시 실행해 채운 뒤 전환하세요")
+                return 1
+
+        if args.switch:
+            try:
+                await migration.switch(min_coverage=args.min_coverage)
+            except (RuntimeError, ValueError) as e:
+                logger.error(f"전환 실패: {e}")
+                return 1
+    finally:
+        await store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,83 @@
+-- report_embeddings 모델 버전 스키마 마이그레이션 (기존 볼륨용)
+--
+-- init.sql은 빈 볼륨에서 처음 뜰 때만 실행되므로, 그 전에 만든 DB에는 이 스크립트를 한 번 실행합니다.
+-- 여러 번 실행해도 안전합니다. (이미 적용된 단계는 건너뜀)
+--
+--   docker exec -i devine_pgvector psql -U devine -d devine_db -v ON_ERROR_STOP=1 \
+--       < migrations/001_embedding_model_versions.sql
+--
+-- 1. embedding_models 생성, 기존 벡터 모델(text-embedding-3-small)을 live로 등록
+-- 2. model, dimension, text_digest 컬럼 추가 및 기존 행 채움
+-- 3. (report_id, model)마다 가장 최근 행만 남기고 중복 삭제
+-- 4. UNIQUE (report_id) 제거 후 UNIQUE (report_id, model) 추가
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS embedding_models (
+    model VARCHAR(100) PRIMARY KEY,
+    dimension INT NOT NULL,
+    is_live BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_embedding_models_live
+ON embedding_models (is_live)
+WHERE is_live;
+
+INSERT INTO embedding_models (model, dimension)
+VALUES ('text-embedding-3-small', 1536)
+ON CONFLICT (model) DO NOTHING;
+
+UPDATE embedding_models SET is_live = TRUE
+WHERE model = 'text-embedding-3-small'
+  AND NOT EXISTS (SELECT 1 FROM embedding_models WHERE is_live);
+
+ALTER TABLE report_embeddings ADD COLUMN IF NOT EXISTS model VARCHAR(100);
+ALTER TABLE report_embeddings ADD COLUMN IF NOT EXISTS dimension INT;
+ALTER TABLE report_embeddings ADD COLUMN IF NOT EXISTS text_digest VARCHAR(64);
+-- 초기 버전 init.sql의 CHAR(64)는 Hibernate 스키마 검증(varchar)과 맞지 않음
+ALTER TABLE report_embeddings ALTER COLUMN text_digest TYPE VARCHAR(64);
+
+-- 모델 컬럼이 없던 행은 모두 당시 live 모델 벡터
+UPDATE report_embeddings
+SET model = (SELECT model FROM embedding_models WHERE is_live)
+WHERE model IS NULL;
+
+UPDATE report_embeddings re
+SET dimension = COALESCE(vector_dims(re.embedding), m.dimension)
+FROM embedding_models m
+WHERE re.dimension IS NULL AND m.model = re.model;
+
+-- (report_id, model)마다 created_at(같으면 id)이 가장 큰 행만 남김
+DELETE FROM report_embeddings re
+USING report_embeddings newer
+WHERE newer.report_id = re.report_id
+  AND newer.model = re.model
+  AND (COALESCE(newer.created_at, '-infinity'::timestamp), newer.id)
+    > (COALESCE(re.created_at, '-infinity'::timestamp), re.id);
+
+ALTER TABLE report_embeddings ALTER COLUMN model SET NOT NULL;
+ALTER TABLE report_embeddings ALTER COLUMN dimension SET NOT NULL;
+
+-- write-behind 도입 시의 UNIQUE (report_id)는 모델별 행과 충돌하므로 제거
+ALTER TABLE report_embeddings DROP CONSTRAINT IF EXISTS report_embeddings_report_id_key;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'report_embeddings_model_fkey'
+    ) THEN
+        ALTER TABLE report_embeddings
+            ADD CONSTRAINT report_embeddings_model_fkey
+            FOREIGN KEY (model) REFERENCES embedding_models (model);
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'report_embeddings_report_id_model_key'
+    ) THEN
+        ALTER TABLE report_embeddings
+            ADD CONSTRAINT report_embeddings_report_id_model_key UNIQUE (report_id, model);
+    END IF;
+END $$;
+
+COMMIT;
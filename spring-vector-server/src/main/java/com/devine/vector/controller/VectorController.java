@@ -32,6 +32,13 @@ public class VectorController {
                     "reportId", request.getReportId(),
                     "saveTimeMs", duration
             ));
+        } catch (IllegalArgumentException e) {
+            log.warn("Save rejected: {}", e.getMessage());
+            return ResponseEntity.badRequest().body(Map.of(
+                    "success", false,
+                    "error", e.getMessage(),
+                    "errorType", e.getClass().getSimpleName()
+            ));
         } catch (Exception e) {
             log.error("Save failed", e);
             return ResponseEntity.internalServerError().body(Map.of(
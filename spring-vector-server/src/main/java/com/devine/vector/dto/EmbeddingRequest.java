@@ -10,5 +10,8 @@ import java.util.List;
 public class EmbeddingRequest {
     private Long reportId;
     private String reportTitle;
+    // AI 서버 /embed 응답의 model, text_digest를 그대로 전달 (live 모델이 아니면 저장 거부)
+    private String model;
+    private String textDigest;
     private List<Double> vector;
 }
@@ -8,7 +8,8 @@ import lombok.Setter;
 import java.time.LocalDateTime;
 
 @Entity
-@Table(name = "report_embeddings")
+@Table(name = "report_embeddings",
+        uniqueConstraints = @UniqueConstraint(columnNames = {"report_id", "model"}))
 @Getter
 @Setter
 @NoArgsConstructor
@@ -21,6 +22,15 @@ public class ReportEmbedding {
     @Column(name = "report_id", nullable = false)
     private Long reportId;
 
+    @Column(name = "model", nullable = false, length = 100)
+    private String model;
+
+    @Column(name = "dimension", nullable = false)
+    private Integer dimension;
+
+    @Column(name = "text_digest", length = 64)
+    private String textDigest;
+
     @Column(name = "report_title", length = 500)
     private String reportTitle;
 
@@ -13,22 +13,37 @@ import java.util.List;
 public interface ReportEmbeddingRepository extends JpaRepository<ReportEmbedding, Long> {
 
     // Native query로 벡터 저장 (JPA에서 vector 타입 직접 처리가 어려움)
+    // 벡터를 만든 모델이 live 모델이고 차원이 맞을 때만 저장하고, (report_id, model)이 이미 있으면 갱신
+    // 반환값이 0이면 모델이 등록되지 않았거나 live가 아님 (검색 대상과 다른 벡터 공간)
     @Modifying(clearAutomatically = true, flushAutomatically = true)
     @Query(value = """
-        INSERT INTO report_embeddings (report_id, report_title, embedding, created_at)
-        VALUES (:reportId, :reportTitle, CAST(:embedding AS vector), CURRENT_TIMESTAMP)
+        INSERT INTO report_embeddings (report_id, model, dimension, text_digest, report_title, embedding, created_at)
+        SELECT :reportId, m.model, m.dimension, :textDigest, :reportTitle,
+               CAST(:embedding AS vector), CURRENT_TIMESTAMP
+        FROM embedding_models m
+        WHERE m.model = :model
+          AND m.is_live
+          AND m.dimension = vector_dims(CAST(:embedding AS vector))
+        ON CONFLICT (report_id, model) DO UPDATE
+        SET report_title = EXCLUDED.report_title,
+            text_digest = COALESCE(EXCLUDED.text_digest, report_embeddings.text_digest),
+            embedding = EXCLUDED.embedding,
+            created_at = EXCLUDED.created_at
         """, nativeQuery = true)
-    void saveEmbedding(
+    int saveEmbedding(
             @Param("reportId") Long reportId,
             @Param("reportTitle") String reportTitle,
+            @Param("model") String model,
+            @Param("textDigest") String textDigest,
             @Param("embedding") String embedding
     );
 
-    // 코사인 유사도 검색 (1 - 거리 = 유사도)
+    // 코사인 유사도 검색 (1 - 거리 = 유사도), live 모델 벡터만 검색
     @Query(value = """
         SELECT re.report_id, re.report_title,
                1 - (re.embedding <=> CAST(:queryVector AS vector)) as similarity
         FROM report_embeddings re
+        JOIN embedding_models m ON m.model = re.model AND m.is_live
         ORDER BY re.embedding <=> CAST(:queryVector AS vector)
         LIMIT :limitCount
         """, nativeQuery = true)
@@ -42,6 +57,7 @@ public interface ReportEmbeddingRepository extends JpaRepository<ReportEmbedding
         SELECT re.report_id, re.report_title,
                re.embedding <-> CAST(:queryVector AS vector) as distance
         FROM report_embeddings re
+        JOIN embedding_models m ON m.model = re.model AND m.is_live
         ORDER BY re.embedding <-> CAST(:queryVector AS vector)
         LIMIT :limitCount
         """, nativeQuery = true)
@@ -50,6 +66,9 @@ public interface ReportEmbeddingRepository extends JpaRepository<ReportEmbedding
             @Param("limitCount") int limitCount
     );
 
-    @Query(value = "SELECT COUNT(*) FROM report_embeddings", nativeQuery = true)
+    @Query(value = """
+        SELECT COUNT(*) FROM report_embeddings re
+        JOIN embedding_models m ON m.model = re.model AND m.is_live
+        """, nativeQuery = true)
     long countEmbeddings();
 }
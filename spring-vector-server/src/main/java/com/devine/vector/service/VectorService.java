@@ -22,13 +22,23 @@ public class VectorService {
 
     @Transactional
     public void saveEmbedding(EmbeddingRequest request) {
+        if (request.getModel() == null || request.getModel().isBlank()) {
+            throw new IllegalArgumentException("model is required (use the model from the /embed response)");
+        }
+
         String vectorString = vectorToString(request.getVector());
-        repository.saveEmbedding(
+        int saved = repository.saveEmbedding(
                 request.getReportId(),
                 request.getReportTitle(),
+                request.getModel(),
+                request.getTextDigest(),
                 vectorString
         );
-        log.info("Saved embedding for reportId: {}", request.getReportId());
+        if (saved == 0) {
+            throw new IllegalArgumentException(
+                    "Model is not registered, not live, or dimension mismatch: " + request.getModel());
+        }
+        log.info("Saved embedding for reportId: {} (model: {})", request.getReportId(), request.getModel());
     }
 
     @Transactional(readOnly = true)
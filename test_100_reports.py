@@ -104,7 +104,7 @@ async def main():
                 print(f"[{i}] 임베딩 실패: {embed_resp.text}")
                 continue
 
-            vector = embed_resp.json()["vector"]
+            embedding = embed_resp.json()
 
             # 2. Spring 서버 저장 시간 측정
             save_start = time.time()
@@ -113,7 +113,9 @@ async def main():
                 json={
                     "reportId": report_id,
                     "reportTitle": title,
-                    "vector": vector
+                    "model": embedding["model"],
+                    "textDigest": embedding["text_digest"],
+                    "vector": embedding["vector"]
                 }
             )
             save_time = (time.time() - save_start) * 1000
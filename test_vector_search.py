@@ -111,8 +111,8 @@ SAMPLE_REPORTS = [
 ]
 
 
-async def get_embedding(client: httpx.AsyncClient, report: dict) -> Optional[list]:
-    """FastAPI 서버에서 임베딩 생성"""
+async def get_embedding(client: httpx.AsyncClient, report: dict) -> Optional[dict]:
+    """FastAPI 서버에서 임베딩 생성 (vector, model, text_digest 포함 응답)"""
     try:
         response = await client.post(
             f"{FASTAPI_URL}/embed",
@@ -120,7 +120,7 @@ async def get_embedding(client: httpx.AsyncClient, report: dict) -> Optional[lis
             timeout=30.0
         )
         if response.status_code == 200:
-            return response.json()["vector"]
+            return response.json()
         else:
             print(f"Embedding error: {response.status_code} - {response.text}")
             return None
@@ -129,15 +129,17 @@ async def get_embedding(client: httpx.AsyncClient, report: dict) -> Optional[lis
         return None
 
 
-async def save_embedding(client: httpx.AsyncClient, report_id: int, title: str, vector: list) -> dict:
-    """Spring 서버에 벡터 저장"""
+async def save_embedding(client: httpx.AsyncClient, report_id: int, title: str, embedding: dict) -> dict:
+    """Spring 서버에 벡터 저장 (임베딩 응답의 model, text_digest를 그대로 전달)"""
     try:
         response = await client.post(
             f"{SPRING_URL}/api/vectors/save",
             json={
                 "reportId": report_id,
                 "reportTitle": title,
-                "vector": vector
+                "model": embedding["model"],
+                "textDigest": embedding["text_digest"],
+                "vector": embedding["vector"]
             },
             timeout=30.0
         )
@@ -195,17 +197,18 @@ async def main():
 
             # 임베딩 생성
             start = time.time()
-            vector = await get_embedding(client, sample["report"])
+            embedding = await get_embedding(client, sample["report"])
             embed_time = (time.time() - start) * 1000
 
-            if vector:
+            if embedding:
+                vector = embedding["vector"]
                 embeddings[report_id] = vector
                 print(f"[{report_id}] {title}")
                 print(f"    임베딩 생성: {embed_time:.1f}ms (차원: {len(vector)})")
 
                 # 저장
                 start = time.time()
-                result = await save_embedding(client, report_id, title, vector)
+                result = await save_embedding(client, report_id, title, embedding)
                 save_time = (time.time() - start) * 1000
                 print(f"    DB 저장: {save_time:.1f}ms")
             else:
@@ -0,0 +1,236 @@
+"""
+서킷 브레이커 / degraded 응답 테스트
+
+실행 방법:
+    python -m pytest tests/test_circuit_breaker.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+import openai
+import pytest
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import Settings
+from app.core.exceptions import ErrorCode, ServiceUnavailableException
+from app.services.circuit_breaker import CircuitBreaker, CircuitState
+from app.services.embedding_cache import EmbeddingCache
+from app.services.embedding_service import EmbeddingResult, EmbeddingService
+from app.services.resilient_embedding_service import ResilientEmbeddingService
+from app.utils.text_processor import text_digest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class UpstreamError(Exception):
+    pass
+
+
+class ClientError(UpstreamError):
+    """OpenAI가 4xx로 거부한 요청 (업스트림 오류지만 장애는 아님)"""
+
+
+class FakeEmbeddingService:
+    def __init__(self, model: str, fail: bool = False, error: BaseException | None = None):
+        self.model = model
+        self.dimension = 2
+        self.fail = fail
+        self.error = error  # 지정하면 업스트림 오류 대신 이 예외를 발생
+        self.calls = 0
+
+    def is_upstream_error(self, error: Exception) -> bool:
+        return isinstance(error, UpstreamError)
+
+    def is_outage_error(self, error: Exception) -> bool:
+        return isinstance(error, UpstreamError) and not isinstance(error, ClientError)
+
+    async def embed_many(self, texts: list[str]) -> list[EmbeddingResult]:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        if self.fail:
+            raise UpstreamError("openai down")
+        return [EmbeddingResult([1.0, 0.0], self.model, text_digest(text)) for text in texts]
+
+
+def _breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(
+        failure_rate_threshold=0.5,
+        minimum_calls=4,
+        window_seconds=30,
+        open_seconds=10,
+        half_open_max_calls=2,
+        clock=clock,
+    )
+
+
+def test_opens_on_failure_rate_and_recovers_through_half_open():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED  # 최소 호출 수 미달
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    clock.now = 10
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # 시험 호출 수 제한
+
+    breaker.record_success()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_failure_reopens():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_released_trial_slot_can_be_reused():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+    breaker.release()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+@pytest.mark.parametrize("error", [ValueError("bad input"), asyncio.CancelledError()])
+def test_half_open_slot_is_released_when_call_ends_without_outcome(error):
+    """업스트림과 무관한 오류나 취소로 끝난 시험 호출이 HALF_OPEN 슬롯을 점유하면 안 됩니다"""
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now = 10
+
+    primary = FakeEmbeddingService("text-embedding-3-small", error=error)
+    service = ResilientEmbeddingService(primary, breaker, EmbeddingCache())
+    for _ in range(3):
+        with pytest.raises(type(error)):
+            asyncio.run(service.embed("text"))
+
+    # 슬롯이 반납되어 정상 호출로 CLOSED까지 복구
+    primary.error = None
+    asyncio.run(service.embed("a"))
+    asyncio.run(service.embed("b"))
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_client_errors_do_not_open_circuit():
+    """4xx 같은 요청 오류는 장애로 세지 않고 대체 백엔드로 넘기지도 않습니다"""
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    primary = FakeEmbeddingService("text-embedding-3-small", error=ClientError("bad request"))
+    fallback = FakeEmbeddingService("local-model")
+    service = ResilientEmbeddingService(primary, breaker, EmbeddingCache(), fallback)
+
+    for _ in range(10):
+        with pytest.raises(ClientError):
+            asyncio.run(service.embed("text"))
+
+    assert breaker.state == CircuitState.CLOSED
+    assert fallback.calls == 0
+
+
+def test_only_timeouts_rate_limits_and_5xx_are_outages():
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+
+    def status_error(cls, status: int):
+        return cls("error", response=httpx.Response(status, request=request), body=None)
+
+    assert EmbeddingService.is_outage_error(openai.APITimeoutError(request=request))
+    assert EmbeddingService.is_outage_error(openai.APIConnectionError(request=request))
+    assert EmbeddingService.is_outage_error(status_error(openai.RateLimitError, 429))
+    assert EmbeddingService.is_outage_error(status_error(openai.InternalServerError, 503))
+    assert not EmbeddingService.is_outage_error(status_error(openai.BadRequestError, 400))
+    assert not EmbeddingService.is_outage_error(status_error(openai.AuthenticationError, 401))
+    assert not EmbeddingService.is_outage_error(ValueError("bad input"))
+
+
+def test_open_circuit_serves_cache_as_degraded_without_calling_openai():
+    clock = FakeClock()
+    primary = FakeEmbeddingService("text-embedding-3-small", fail=True)
+    cache = EmbeddingCache()
+    cache.put(primary.model, text_digest("cached"), [0.5, 0.5])
+    service = ResilientEmbeddingService(primary, _breaker(clock), cache)
+
+    for _ in range(4):
+        with pytest.raises(UpstreamError):
+            asyncio.run(service.embed("new text"))
+    calls = primary.calls
+
+    result = asyncio.run(service.embed("cached"))
+    assert result.degraded
+    assert result.vector == [0.5, 0.5]
+
+    # 캐시에 없으면 OpenAI를 호출하지 않고 즉시 503
+    with pytest.raises(ServiceUnavailableException) as exc_info:
+        asyncio.run(service.embed("new text"))
+    assert exc_info.value.error_code == ErrorCode.CIRCUIT_OPEN
+    assert primary.calls == calls
+
+
+def test_fallback_backend_marks_response_degraded():
+    clock = FakeClock()
+    primary = FakeEmbeddingService("text-embedding-3-small", fail=True)
+    fallback = FakeEmbeddingService("local-model")
+    service = ResilientEmbeddingService(primary, _breaker(clock), EmbeddingCache(), fallback)
+
+    result = asyncio.run(service.embed("text"))
+
+    assert result.degraded
+    assert result.model == "local-model"
+
+
+@pytest.mark.parametrize(
+    "fallback_model",
+    [None, "text-embedding-3-small"],
+)
+def test_fallback_model_must_be_set_and_differ_from_primary(fallback_model):
+    """대체 백엔드 벡터를 모델명으로 구분하므로 비어 있거나 기본 모델과 같으면 설정 오류"""
+    with pytest.raises(ValueError, match="FALLBACK_EMBEDDING_MODEL"):
+        Settings(
+            _env_file=None,
+            OPENAI_API_KEY="test",
+            EMBEDDING_MODEL="text-embedding-3-small",
+            FALLBACK_EMBEDDING_BASE_URL="http://localhost:11434/v1",
+            FALLBACK_EMBEDDING_MODEL=fallback_model,
+        )
+
+    settings = Settings(
+        _env_file=None,
+        OPENAI_API_KEY="test",
+        FALLBACK_EMBEDDING_BASE_URL="http://localhost:11434/v1",
+        FALLBACK_EMBEDDING_MODEL="nomic-embed-text",
+    )
+    assert settings.FALLBACK_EMBEDDING_MODEL == "nomic-embed-text"
@@ -0,0 +1,192 @@
+"""
+클러스터 인덱스 테스트
+
+실행 방법:
+    python -m pytest tests/test_cluster_index.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.cluster_index import ClusterIndex, assign_clusters, train_centroids
+
+DIMENSION = 32
+
+
+def _blobs(num_topics: int = 4, per_topic: int = 50, seed: int = 0):
+    """주제별로 모인 벡터 (주제 중심 + 작은 잡음)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((num_topics, DIMENSION))
+    vectors = np.concatenate(
+        [center + 0.05 * rng.standard_normal((per_topic, DIMENSION)) for center in centers]
+    ).astype(np.float32)
+    return list(range(len(vectors))), vectors
+
+
+def test_coarse_to_fine_search_matches_exhaustive_top_result():
+    report_ids, vectors = _blobs()
+    index = ClusterIndex(dimension=DIMENSION)
+    index.fit(report_ids, vectors, num_clusters=4)
+
+    results = index.search(vectors[10], k=5, nprobe=1)
+
+    assert results[0][0] == 10
+    # 같은 주제(0~49)의 리포트만 반환
+    assert all(report_id < 50 for report_id, _ in results)
+
+
+def test_clusters_follow_topics_for_browsing():
+    report_ids, vectors = _blobs()
+    index = ClusterIndex(dimension=DIMENSION)
+    index.fit(report_ids, vectors, num_clusters=4)
+
+    assert sorted(len(index.members(c)) for c in range(4)) == [50, 50, 50, 50]
+    assert index.cluster_of(0) == index.cluster_of(49)
+    assert index.cluster_of(0) != index.cluster_of(50)
+
+
+def test_incremental_add_and_imbalance_detection():
+    report_ids, vectors = _blobs()
+    index = ClusterIndex(dimension=DIMENSION, imbalance_threshold=2.0)
+    index.fit(report_ids, vectors, num_clusters=4)
+    assert not index.balance().needs_retraining
+
+    # 한 주제에만 새 리포트가 몰리는 경우
+    rng = np.random.default_rng(1)
+    target_cluster = index.cluster_of(0)
+    for offset in range(300):
+        vector = vectors[0] + 0.05 * rng.standard_normal(DIMENSION)
+        assert index.add(1000 + offset, vector) == target_cluster
+
+    balance = index.balance()
+    assert len(index) == 500
+    assert balance.needs_retraining
+    assert balance.max_ratio > 2.0
+
+
+def test_re_adding_report_moves_it_between_clusters():
+    report_ids, vectors = _blobs()
+    index = ClusterIndex(dimension=DIMENSION)
+    index.fit(report_ids, vectors, num_clusters=4)
+
+    index.add(0, vectors[60])
+
+    assert len(index) == 200
+    assert index.cluster_of(0) == index.cluster_of(60)
+    assert sum(index.balance().sizes) == 200
+
+
+def test_retrain_swaps_in_assignment_and_reassigns_rows_changed_meanwhile():
+    """스레드에서 계산한 배정으로 교체하되, 학습 중 추가/갱신된 행은 새 중심점에 다시 배정해야 합니다"""
+    report_ids, vectors = _blobs()
+    index = ClusterIndex(dimension=DIMENSION)
+    index.fit(report_ids, vectors, num_clusters=2)
+
+    snapshot = index.begin_retrain()
+    # 학습하는 동안 들어온 변경: 새 리포트 추가, 기존 리포트 내용 변경
+    index.add(500, vectors[120])
+    index.add(0, vectors[180])
+    assignment = assign_clusters(snapshot, train_centroids(snapshot, 4))
+    index.swap(assignment)
+
+    assert index.num_clusters == 4
+    assert len(index) == 201
+    assert sum(index.balance().sizes) == 201
+    assert sum(len(index.members(c)) for c in range(4)) == 201
+    assert index.cluster_of(500) == index.cluster_of(120)
+    assert index.cluster_of(0) == index.cluster_of(180)
+    assert index.cluster_of(0) != index.cluster_of(1)
+
+
+def test_untrained_index_with_vectors_needs_retraining():
+    """학습 전(클러스터 0개) 인덱스에 벡터가 쌓이면 재학습 대상이어야 합니다"""
+    index = ClusterIndex(dimension=DIMENSION)
+    assert not index.balance().needs_retraining
+
+    _, vectors = _blobs(num_topics=1, per_topic=3)
+    for report_id, vector in enumerate(vectors):
+        assert index.add(report_id, vector) == -1
+
+    balance = index.balance()
+    assert balance.sizes == []
+    assert balance.needs_retraining
+
+
+def test_remove_keeps_rows_and_members_consistent():
+    report_ids, vectors = _blobs()
+    index = ClusterIndex(dimension=DIMENSION)
+    index.fit(report_ids, vectors, num_clusters=4)
+
+    assert index.remove(10)
+    assert not index.remove(10)
+
+    assert len(index) == 199
+    assert index.cluster_of(10) is None
+    assert all(report_id != 10 for report_id, _ in index.search(vectors[10], k=10, nprobe=4))
+    # 빈 자리로 옮겨진 마지막 행도 그대로 검색/탐색 가능
+    assert index.search(vectors[199], k=1, nprobe=1)[0][0] == 199
+    assert 199 in index.members(index.cluster_of(199))
+    assert sum(index.balance().sizes) == 199
+
+
+def test_remove_during_retrain_is_applied_on_swap():
+    report_ids, vectors = _blobs()
+    index = ClusterIndex(dimension=DIMENSION)
+    index.fit(report_ids, vectors, num_clusters=2)
+
+    snapshot = index.begin_retrain()
+    index.remove(5)
+    index.remove(199)
+    assert len(index) == 198
+    assert all(report_id not in (5, 199) for report_id, _ in index.search(vectors[5], k=50, nprobe=2))
+
+    index.swap(assign_clusters(snapshot, train_centroids(snapshot, 4)))
+
+    assert len(index) == 198
+    assert sum(len(index.members(c)) for c in range(4)) == 198
+    assert index.cluster_of(5) is None
+    assert index.search(vectors[198], k=1, nprobe=1)[0][0] == 198
+
+
+def test_batched_extend_into_reserved_arrays_matches_fit():
+    """건수만큼 미리 잡은 배열에 배치를 채우면 재할당 없이 한 번에 fit한 것과 같아야 합니다"""
+    report_ids, vectors = _blobs()
+    expected = ClusterIndex(dimension=DIMENSION)
+    expected.fit(report_ids, vectors, num_clusters=4)
+
+    index = ClusterIndex(dimension=DIMENSION)
+    index.reserve(len(vectors))
+    buffer = index._vectors
+    for start in range(0, len(vectors), 64):
+        index.extend(report_ids[start : start + 64], vectors[start : start + 64])
+    index.train(num_clusters=4)
+
+    assert index._vectors is buffer
+    assert len(index) == len(vectors)
+    np.testing.assert_allclose(index._vectors[: len(index)], expected._vectors[: len(expected)])
+    assert [index.cluster_of(r) for r in report_ids] == [expected.cluster_of(r) for r in report_ids]
+
+
+def test_extend_updates_existing_reports_in_place():
+    index = ClusterIndex(dimension=2)
+    index.extend([1, 2], np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32))
+    index.extend([2, 3], np.array([[3.0, 0.0], [0.0, 2.0]], dtype=np.float32))
+
+    assert len(index) == 3
+    np.testing.assert_allclose(index._vectors[index._rows[2]], [1.0, 0.0])
+
+
+def test_chunked_assignment_matches_single_pass():
+    _, vectors = _blobs()
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    centroids = train_centroids(vectors, 4)
+
+    chunked = assign_clusters(vectors, centroids, chunk_size=7)
+
+    np.testing.assert_array_equal(chunked.assignments, (vectors @ centroids.T).argmax(axis=1))
+    assert chunked.counts.sum() == len(vectors)
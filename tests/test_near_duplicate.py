@@ -0,0 +1,190 @@
+"""
+근접 중복 리포트 감지 (MinHash + LSH) 테스트
+
+실행 방법:
+    python -m pytest tests/test_near_duplicate.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.embedding_cache import EmbeddingCache
+from app.services.embedding_service import EmbeddingResult
+from app.services.near_duplicate import NearDuplicateIndex
+from app.services.resilient_embedding_service import ResilientEmbeddingService
+from app.utils.text_processor import extract_embedding_text, text_digest
+
+
+def _report(features: list[str], summary: str = "이커머스 플랫폼을 위한 Node.js 백엔드 시스템입니다.") -> dict:
+    return {
+        "overview": {
+            "summary": summary + " JavaScript와 Express.js를 활용하여 개발되었습니다.",
+            "mainTech": "JavaScript 기반 Express.js 프레임워크를 활용한 개발",
+        },
+        "projectInfo": {"techStack": ["JavaScript", "Express.js", "PostgreSQL", "Redis", "Docker"]},
+        "keyImplementations": [{"title": feature} for feature in features],
+    }
+
+
+ORIGINAL = extract_embedding_text(_report(["JWT 인증 및 권한 관리", "실시간 알림 시스템", "파일 업로드 처리"]))
+# 구현 항목 순서만 바뀐 사본
+REORDERED = extract_embedding_text(_report(["파일 업로드 처리", "JWT 인증 및 권한 관리", "실시간 알림 시스템"]))
+# 구현 항목 제목 하나만 바뀐 사본
+RETITLED = extract_embedding_text(_report(["JWT 인증 및 권한 관리", "실시간 알림 시스템", "검색 엔진 연동"]))
+UNRELATED = extract_embedding_text(
+    {
+        "overview": {"summary": "iOS 헬스케어 앱", "mainTech": "Swift 기반 SwiftUI 개발"},
+        "projectInfo": {"techStack": ["Swift", "SwiftUI", "HealthKit"]},
+        "keyImplementations": [{"title": "심박수 측정"}, {"title": "운동 기록 동기화"}],
+    }
+)
+
+
+def test_detects_reordered_and_retitled_copies_but_not_unrelated():
+    index = NearDuplicateIndex(threshold=0.8)
+    index.add("original", index.signature(ORIGINAL))
+
+    for text in (REORDERED, RETITLED):
+        match = index.query(index.signature(text))
+        assert match is not None
+        assert match.key == "original"
+        assert match.similarity >= 0.8
+
+    assert index.query(index.signature(UNRELATED)) is None
+
+
+def test_groups_reports_and_picks_first_as_canonical():
+    index = NearDuplicateIndex()
+    index.add("a", index.signature(ORIGINAL))
+    assert index.link_report("a", 1).canonical == 1
+
+    signature = index.signature(REORDERED)
+    index.add("b", signature, duplicate_of=index.query(signature).key)
+    assert index.link_report("b", 2).canonical == 1
+
+    assert index.report_for("b") == 1
+    assert index.duplicates_of(1) == [2]
+
+
+def test_canonical_leaving_group_promotes_next_report():
+    """대표 리포트 내용이 바뀌어 그룹을 떠나면 다음 리포트가 새 대표가 되어야 합니다"""
+    index = NearDuplicateIndex()
+    index.add("a", index.signature(ORIGINAL))
+    index.link_report("a", 1)
+    signature = index.signature(REORDERED)
+    index.add("b", signature, duplicate_of="a")
+    index.link_report("b", 2)
+
+    index.add("c", index.signature(UNRELATED))
+    link = index.link_report("c", 1)
+
+    assert link.canonical == 1
+    assert link.promoted == 2
+    assert link.promoted_key == "b"
+    assert index.report_for("b") == 2
+    assert index.duplicates_of(2) == []
+    # 대표가 아닌 리포트가 떠날 때는 승격 없음
+    assert index.link_report("a", 3).promoted is None
+
+
+def test_report_links_are_bounded_and_forget_whole_group_with_canonical():
+    """연결된 리포트 수도 max_entries로 제한하고, 대표를 잊으면 그룹의 다른 리포트도 함께 잊어야 합니다"""
+    index = NearDuplicateIndex(max_entries=3)
+    index.add("a", index.signature(ORIGINAL))
+    index.add("b", index.signature(REORDERED), duplicate_of="a")
+    index.add("c", index.signature(UNRELATED))
+    index.link_report("a", 1)
+    index.link_report("b", 2)
+    index.link_report("c", 3)
+
+    # 가장 오래된 리포트 1(대표)을 잊으면서 같은 그룹의 2도 잊음
+    assert index.link_report("c", 4).canonical == 3
+    assert index.report_for("a") is None
+    assert index.duplicates_of(2) == []
+    assert len(index._report_keys) == 2
+    assert set(index._group_reports) == {"c"}
+
+    # 다시 연결된 리포트는 최근 것으로 취급하고, 대표가 아닌 리포트는 그것만 잊음
+    index.link_report("c", 3)
+    index.link_report("a", 5)
+    index.link_report("b", 6)
+    assert index.report_for("c") == 3
+    assert index.duplicates_of(3) == []
+    assert index.duplicates_of(5) == [6]
+    assert len(index._report_keys) == 3
+
+
+def test_evicts_oldest_entries():
+    index = NearDuplicateIndex(max_entries=1)
+    index.add("original", index.signature(ORIGINAL))
+    index.add("unrelated", index.signature(UNRELATED))
+
+    assert len(index) == 1
+    assert index.query(index.signature(REORDERED)) is None
+
+
+class FakeEmbeddingService:
+    def __init__(self):
+        self.model = "primary"
+        self.dimension = 2
+        self.calls = 0
+
+    def is_upstream_error(self, error: Exception) -> bool:
+        return False
+
+    def is_outage_error(self, error: Exception) -> bool:
+        return False
+
+    async def embed_many(self, texts: list[str]) -> list[EmbeddingResult]:
+        self.calls += 1
+        return [EmbeddingResult([1.0, 0.0], self.model, text_digest(text)) for text in texts]
+
+
+def _service(reuse: bool) -> tuple[ResilientEmbeddingService, FakeEmbeddingService]:
+    primary = FakeEmbeddingService()
+    service = ResilientEmbeddingService(
+        primary=primary,
+        breaker=CircuitBreaker(),
+        cache=EmbeddingCache(),
+        near_duplicates=NearDuplicateIndex(),
+        reuse_near_duplicates=reuse,
+    )
+    return service, primary
+
+
+def test_reuse_mode_skips_embedding_for_near_duplicate():
+    service, primary = _service(reuse=True)
+
+    first = asyncio.run(service.embed(ORIGINAL))
+    second = asyncio.run(service.embed(REORDERED))
+
+    assert primary.calls == 1
+    assert first.near_duplicate is None
+    assert second.near_duplicate.key == text_digest(ORIGINAL)
+    assert second.near_duplicate.reused
+    assert second.vector == first.vector
+    # 벡터를 만든 원본 텍스트의 다이제스트 (저장 시 마이그레이션 재임베딩 대상으로 남도록)
+    assert second.text_digest == text_digest(ORIGINAL)
+    # 다른 텍스트의 벡터를 이 텍스트의 다이제스트로 캐시하지 않음
+    assert service.cache.get(primary.model, text_digest(REORDERED)) is None
+
+    # 같은 텍스트가 다시 들어와도 원본 벡터를 재사용
+    again = asyncio.run(service.embed(REORDERED))
+    assert primary.calls == 1
+    assert again.near_duplicate.reused
+
+
+def test_flag_mode_still_embeds_near_duplicate():
+    service, primary = _service(reuse=False)
+
+    asyncio.run(service.embed(ORIGINAL))
+    second = asyncio.run(service.embed(RETITLED))
+
+    assert primary.calls == 2
+    assert second.near_duplicate.key == text_digest(ORIGINAL)
+    assert not second.near_duplicate.reused
@@ -0,0 +1,145 @@
+"""
+우선순위 레인 스케줄러 테스트
+
+실행 방법:
+    python -m pytest tests/test_priority_scheduler.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import Settings, get_settings
+from app.core.exceptions import BadRequestException
+from app.services.priority_scheduler import Priority, PriorityScheduler
+
+
+def test_bulk_cannot_use_reserved_interactive_slots():
+    """bulk가 몰려도 interactive 전용 슬롯은 비어 있어야 합니다"""
+
+    async def scenario():
+        scheduler = PriorityScheduler(max_concurrency=4, interactive_reserved=2)
+        for _ in range(2):
+            await scheduler.acquire(Priority.BULK, 1)
+
+        blocked_bulk = asyncio.create_task(scheduler.acquire(Priority.BULK, 1))
+        await asyncio.sleep(0)
+        assert not blocked_bulk.done()
+
+        await asyncio.wait_for(scheduler.acquire(Priority.INTERACTIVE, 1), timeout=1)
+
+        scheduler.release(Priority.BULK)
+        await asyncio.wait_for(blocked_bulk, timeout=1)
+        return scheduler.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert stats["bulk"]["in_flight"] == 2
+    assert stats["interactive"]["in_flight"] == 1
+
+
+def test_slots_are_shared_by_weight_when_both_lanes_wait():
+    """두 레인이 모두 대기 중이면 weight 비율로 슬롯을 받아야 합니다"""
+
+    async def scenario():
+        scheduler = PriorityScheduler(
+            max_concurrency=1,
+            interactive_reserved=0,
+            interactive_weight=3,
+            bulk_weight=1,
+        )
+        await scheduler.acquire(Priority.BULK, 1)  # 슬롯 점유
+
+        order: list[Priority] = []
+
+        async def worker(priority: Priority):
+            async with scheduler.slot(priority, 1):
+                order.append(priority)
+
+        tasks = [asyncio.create_task(worker(Priority.BULK)) for _ in range(4)]
+        tasks += [asyncio.create_task(worker(Priority.INTERACTIVE)) for _ in range(6)]
+        await asyncio.sleep(0)
+
+        scheduler.release(Priority.BULK)
+        await asyncio.gather(*tasks)
+        return order
+
+    order = asyncio.run(scenario())
+
+    assert order[:8].count(Priority.INTERACTIVE) == 6
+    assert order[:8].count(Priority.BULK) == 2
+
+
+def test_bulk_cannot_borrow_interactive_token_share():
+    """bulk는 자기 토큰 몫을 다 쓰면 기다리고, interactive는 자기 몫으로 바로 실행되어야 합니다"""
+
+    async def scenario():
+        scheduler = PriorityScheduler(
+            max_concurrency=8,
+            interactive_reserved=2,
+            tokens_per_minute=6000,
+            interactive_token_share=0.5,
+        )
+        async with scheduler.slot(Priority.BULK, 3000):
+            pass
+
+        blocked_bulk = asyncio.create_task(scheduler.acquire(Priority.BULK, 3000))
+        await asyncio.sleep(0)
+        assert not blocked_bulk.done()
+
+        await asyncio.wait_for(scheduler.acquire(Priority.INTERACTIVE, 3000), timeout=1)
+        blocked_bulk.cancel()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize(
+    ("headers", "default", "expected"),
+    [
+        ({}, Priority.INTERACTIVE, Priority.INTERACTIVE),
+        ({"X-Priority": "bulk"}, Priority.INTERACTIVE, Priority.BULK),
+        # 헤더로 우선순위를 올릴 수 없음
+        ({"X-Priority": "interactive"}, Priority.BULK, Priority.BULK),
+        ({"X-API-Key": "backfill", "X-Priority": "interactive"}, Priority.INTERACTIVE, Priority.BULK),
+        ({"X-API-Key": "backfill"}, Priority.INTERACTIVE, Priority.BULK),
+    ],
+)
+def test_resolve_priority_header_only_downgrades(monkeypatch, headers, default, expected):
+    from app.main import resolve_priority
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("BULK_API_KEYS", '["backfill"]')
+    get_settings.cache_clear()
+    try:
+        request = SimpleNamespace(headers=headers)
+        assert resolve_priority(request, default=default) == expected
+        with pytest.raises(BadRequestException):
+            resolve_priority(SimpleNamespace(headers={"X-Priority": "urgent"}), default=default)
+    finally:
+        get_settings.cache_clear()
+
+
+@pytest.mark.parametrize(
+    ("reserved", "share"),
+    [(16, 0.3), (17, 0.3), (-1, 0.3), (4, 1.0)],
+)
+def test_rejects_settings_that_leave_bulk_without_capacity(reserved, share):
+    """bulk 레인에 슬롯이나 토큰이 남지 않는 설정은 bulk가 영원히 대기하므로 거부해야 합니다"""
+    with pytest.raises(ValueError):
+        PriorityScheduler(
+            max_concurrency=16, interactive_reserved=reserved, interactive_token_share=share
+        )
+    with pytest.raises(ValueError, match="SCHEDULER_INTERACTIVE_RESERVED|INTERACTIVE_TOKEN_SHARE"):
+        Settings(
+            _env_file=None,
+            OPENAI_API_KEY="test",
+            SCHEDULER_MAX_CONCURRENCY=16,
+            SCHEDULER_INTERACTIVE_RESERVED=reserved,
+            INTERACTIVE_TOKEN_SHARE=share,
+        )
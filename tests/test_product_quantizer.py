@@ -0,0 +1,98 @@
+"""
+Product Quantization 코덱 테스트
+
+실행 방법:
+    python -m pytest tests/test_product_quantizer.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.product_quantizer import PQIndex, ProductQuantizer
+
+DIMENSION = 64
+
+
+def _make_vectors(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n, DIMENSION)).astype(np.float32)
+
+
+def test_encode_produces_compact_codes():
+    """벡터 하나가 M 바이트 코드로 압축되어야 합니다"""
+    vectors = _make_vectors(500)
+    quantizer = ProductQuantizer(dimension=DIMENSION, num_subvectors=8, num_centroids=32)
+    quantizer.train(vectors, iterations=5)
+
+    codes = quantizer.encode(vectors)
+
+    assert codes.shape == (500, 8)
+    assert codes.dtype == np.uint8
+    assert quantizer.decode(codes).shape == (500, DIMENSION)
+
+
+def test_search_with_rerank_finds_exact_match(tmp_path):
+    """재정렬을 켜면 저장된 벡터 자신이 1위로 나와야 합니다"""
+    vectors = _make_vectors(500)
+    quantizer = ProductQuantizer(dimension=DIMENSION, num_subvectors=8, num_centroids=32)
+    quantizer.train(vectors, iterations=5)
+
+    index = PQIndex(quantizer, vectors_path=tmp_path / "vectors.f32")
+    index.add(list(range(1000, 1500)), vectors)
+
+    results = index.search(vectors[42], k=5, rerank_candidates=50)
+
+    assert results[0][0] == 1042
+    assert abs(results[0][1] - 1.0) < 1e-4
+    assert index.memory_bytes < vectors.nbytes
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    """저장 후 로드한 인덱스가 같은 결과를 반환해야 합니다"""
+    vectors = _make_vectors(300)
+    quantizer = ProductQuantizer(dimension=DIMENSION, num_subvectors=8, num_centroids=16)
+    quantizer.train(vectors, iterations=5)
+
+    index = PQIndex(quantizer, vectors_path=tmp_path / "vectors.f32")
+    index.add(list(range(300)), vectors)
+    index.save(tmp_path)
+
+    loaded = PQIndex.load(tmp_path)
+
+    assert len(loaded) == 300
+    assert loaded.search(vectors[7], k=3) == index.search(vectors[7], k=3)
+
+
+def test_new_index_does_not_reuse_existing_vectors_file(tmp_path):
+    """기존 벡터 파일을 가리켜도 새 인덱스의 행과 어긋나지 않아야 합니다"""
+    vectors = _make_vectors(300)
+    quantizer = ProductQuantizer(dimension=DIMENSION, num_subvectors=8, num_centroids=16)
+    quantizer.train(vectors, iterations=5)
+    (tmp_path / "vectors.f32").write_bytes(_make_vectors(100, seed=1).tobytes())
+
+    index = PQIndex(quantizer, vectors_path=tmp_path / "vectors.f32")
+    index.add(list(range(300)), vectors)
+
+    assert index.search(vectors[7], k=1, rerank_candidates=50)[0][0] == 7
+
+
+def test_load_keeps_rerank_vectors_from_other_path(tmp_path):
+    """vectors_path가 저장 디렉터리 밖이어도 로드 후 재정렬이 가능해야 합니다"""
+    vectors = _make_vectors(300)
+    quantizer = ProductQuantizer(dimension=DIMENSION, num_subvectors=8, num_centroids=16)
+    quantizer.train(vectors, iterations=5)
+
+    index = PQIndex(quantizer, vectors_path=tmp_path / "build.f32")
+    index.add(list(range(300)), vectors)
+    index.save(tmp_path / "saved")
+
+    loaded = PQIndex.load(tmp_path / "saved")
+
+    result = loaded.search(vectors[7], k=1, rerank_candidates=50)
+    assert result[0][0] == 7
+    assert abs(result[0][1] - 1.0) < 1e-4
@@ -0,0 +1,60 @@
+"""
+프로파일링 훅 테스트
+
+실행 방법:
+    python -m pytest tests/test_profiling.py
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.profiling import EventLoopMonitor, SamplingProfiler
+
+
+def test_event_loop_monitor_detects_blocking_callback():
+    """루프를 막는 동기 코드가 lag과 slow callback으로 기록되어야 합니다"""
+
+    async def scenario():
+        monitor = EventLoopMonitor(interval=0.02, slow_threshold=0.1)
+        monitor.start()
+        await asyncio.sleep(0.05)
+
+        time.sleep(0.3)  # 이벤트 루프 블로킹
+
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+        return monitor.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert stats["slow_callbacks"] >= 1
+    assert stats["lag_ms_max"] >= 200
+
+
+def test_sampling_profiler_returns_collapsed_stacks():
+    """다른 스레드의 스택이 collapsed 형식으로 수집되어야 합니다"""
+    stop = threading.Event()
+
+    def busy_worker():
+        while not stop.is_set():
+            sum(range(1000))
+
+    worker = threading.Thread(target=busy_worker, name="busy")
+    worker.start()
+    try:
+        output = SamplingProfiler().profile(seconds=0.2, interval=0.005)
+    finally:
+        stop.set()
+        worker.join()
+
+    busy_lines = [line for line in output.splitlines() if line.startswith("busy;")]
+    assert busy_lines
+    stack, count = busy_lines[0].rsplit(" ", 1)
+    assert "busy_worker" in stack
+    assert int(count) > 0
@@ -0,0 +1,55 @@
+"""
+서버 시작 비용 테스트
+
+app.main 임포트 시 무거운 의존성(openai, tenacity)이 로드되지 않고
+임포트 시간이 예산 안에 들어오는지 확인합니다.
+
+실행 방법:
+    python -m pytest tests/test_startup.py
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# FastAPI 자체 임포트(약 0.5초)를 포함한 상한
+IMPORT_BUDGET_SECONDS = 1.5
+
+LAZY_MODULES = ["openai", "tenacity"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "elapsed": elapsed,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+
+def _probe_import() -> dict:
+    # 새 인터프리터에서 측정해야 다른 테스트의 임포트 캐시 영향을 받지 않음
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_heavy_dependencies_are_lazy():
+    """openai, tenacity는 임포트 시점에 로드되면 안 됩니다"""
+    assert _probe_import()["loaded"] == []
+
+
+def test_import_time_budget():
+    """app.main 임포트가 예산 안에 끝나야 합니다"""
+    elapsed = _probe_import()["elapsed"]
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"임포트 {elapsed:.2f}초 (예산 {IMPORT_BUDGET_SECONDS}초)"
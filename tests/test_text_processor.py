@@ -0,0 +1,53 @@
+"""
+대량 텍스트 추출 테스트
+
+실행 방법:
+    python -m pytest tests/test_text_processor.py
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import orjson
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.text_processor import (
+    extract_embedding_text,
+    extract_embedding_texts,
+    text_digest,
+)
+
+REPORTS = [
+    {
+        "overview": {"summary": f"프로젝트 {i} 요약", "mainTech": "FastAPI"},
+        "projectInfo": {"techStack": ["Python", "PostgreSQL"]},
+        "keyImplementations": [{"title": f"기능 {i}"}],
+    }
+    for i in range(25)
+]
+
+EXPECTED = [
+    (extract_embedding_text(report), text_digest(extract_embedding_text(report)))
+    for report in REPORTS
+]
+
+NDJSON = b"\n".join(orjson.dumps(report) for report in REPORTS) + b"\n"
+
+
+def test_bulk_matches_single_extraction():
+    """대량 추출 결과가 단건 추출과 같고 입력 순서를 유지해야 합니다"""
+    assert list(extract_embedding_texts(REPORTS, chunk_size=7)) == EXPECTED
+
+
+def test_ndjson_buffer_and_stream():
+    """NDJSON 바이트 버퍼와 바이너리 스트림을 모두 받아야 합니다"""
+    assert list(extract_embedding_texts(NDJSON)) == EXPECTED
+    assert list(extract_embedding_texts(io.BytesIO(NDJSON))) == EXPECTED
+
+
+def test_process_pool_preserves_order():
+    """프로세스 풀로 분산해도 결과 순서가 같아야 합니다"""
+    assert list(extract_embedding_texts(NDJSON, workers=2, chunk_size=4)) == EXPECTED
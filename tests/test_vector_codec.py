@@ -0,0 +1,108 @@
+"""
+임베딩 벡터 변환 (base64 → float32 배열) 테스트
+
+실행 방법:
+    python -m pytest tests/test_vector_codec.py
+"""
+
+import asyncio
+import base64
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import orjson
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import get_settings
+from app.services.embedding_service import EmbeddingService
+from app.utils.vector_codec import as_vector, decode_embedding, encode_base64
+
+VECTOR = np.array([0.25, -1.5, 3.0], dtype=np.float32)
+
+
+def test_decodes_base64_into_read_only_float32_buffer():
+    vector = decode_embedding(base64.b64encode(VECTOR.tobytes()).decode())
+
+    assert vector.dtype == np.float32
+    assert not vector.flags.writeable
+    np.testing.assert_array_equal(vector, VECTOR)
+
+
+def test_accepts_float_list_from_servers_without_base64():
+    vector = decode_embedding([0.25, -1.5, 3.0])
+
+    assert vector.dtype == np.float32
+    np.testing.assert_array_equal(vector, VECTOR)
+
+
+def test_base64_round_trip_and_no_copy_for_float32():
+    assert np.shares_memory(as_vector(VECTOR), VECTOR)
+    np.testing.assert_array_equal(decode_embedding(encode_base64(VECTOR)), VECTOR)
+
+
+def test_orjson_writes_array_as_json_numbers():
+    body = orjson.dumps({"vector": as_vector(VECTOR)}, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    assert orjson.loads(body) == {"vector": [0.25, -1.5, 3.0]}
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.kwargs = None
+
+    async def create(self, **kwargs):
+        self.kwargs = kwargs
+        # 순서가 뒤섞여 와도 index 기준으로 정렬되어야 함
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=1, embedding=encode_base64(VECTOR * 2)),
+                SimpleNamespace(index=0, embedding=encode_base64(VECTOR)),
+            ]
+        )
+
+
+def _service(monkeypatch) -> tuple[EmbeddingService, FakeEmbeddings]:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    get_settings.cache_clear()
+    service = EmbeddingService()
+    embeddings = FakeEmbeddings()
+    service._client = SimpleNamespace(embeddings=embeddings)
+    return service, embeddings
+
+
+def test_embed_many_requests_base64_and_returns_arrays(monkeypatch):
+    service, embeddings = _service(monkeypatch)
+
+    results = asyncio.run(service.embed_many(["a", "b"]))
+
+    assert embeddings.kwargs["encoding_format"] == "base64"
+    assert all(isinstance(result.vector, np.ndarray) for result in results)
+    np.testing.assert_array_equal(results[0].vector, VECTOR)
+    np.testing.assert_array_equal(results[1].vector, VECTOR * 2)
+
+
+def test_create_embeddings_still_returns_float_lists(monkeypatch):
+    service, _ = _service(monkeypatch)
+
+    vectors = asyncio.run(service.create_embeddings(["a", "b"]))
+
+    assert vectors[0] == [0.25, -1.5, 3.0]
+    assert all(isinstance(v, float) for v in vectors[0])
+
+
+def test_text_embedding_3_requests_configured_dimension(monkeypatch):
+    """text-embedding-3 계열은 저장 차원으로 출력하도록 dimensions를 보내야 합니다"""
+    service, embeddings = _service(monkeypatch)
+    service.model = "text-embedding-3-large"
+
+    asyncio.run(service.embed_many(["a", "b"]))
+    assert embeddings.kwargs["dimensions"] == service.dimension
+
+    # dimensions를 모르는 로컬/구형 모델에는 보내지 않음
+    service.model = "nomic-embed-text"
+    asyncio.run(service.embed_many(["a", "b"]))
+    assert "dimensions" not in embeddings.kwargs
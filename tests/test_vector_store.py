@@ -0,0 +1,529 @@
+"""
+임베딩 저장소 테스트 (SQLite 저장소 사용)
+
+- write-behind 버퍼 (종료 시 flush 보존, 실패 행 격리)
+- 모델 버전별 upsert, 마이그레이션 후 원자적 전환
+- pgvector 바이너리 코덱, COPY → 스테이징 → ON CONFLICT 흐름 (가짜 asyncpg 연결)
+
+실행 방법:
+    python -m pytest tests/test_vector_store.py
+"""
+
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import get_settings
+from app.core.readiness import Readiness
+from app.services.embedding_migration import EmbeddingMigration, read_report_sources
+from app.services.embedding_service import EmbeddingResult
+from app.services.vector_store import (
+    EmbeddingRecord,
+    PostgresVectorStore,
+    SQLiteVectorStore,
+    VectorStore,
+    WriteBehindBuffer,
+    _decode_pgvector,
+    _encode_pgvector,
+    create_vector_store,
+)
+from app.utils.text_processor import text_digest
+
+MODEL = "text-embedding-3-small"
+
+
+def _record(report_id: int, vector: list[float], title: str | None = None, digest: str = "d") -> EmbeddingRecord:
+    return EmbeddingRecord(report_id, vector, MODEL, digest, title)
+
+
+class FailingStore(VectorStore):
+    """첫 번째 upsert만 실패하는 저장소"""
+
+    def __init__(self):
+        self.calls = 0
+        self.saved: list[EmbeddingRecord] = []
+
+    async def upsert_many(self, records):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("db down")
+        self.saved.extend(records)
+
+
+class SlowStore(VectorStore):
+    """upsert에 시간이 걸리는 저장소"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.saved: list[EmbeddingRecord] = []
+
+    async def upsert_many(self, records):
+        await asyncio.sleep(self.delay)
+        self.saved.extend(records)
+
+
+class PoisonStore(VectorStore):
+    """특정 report_id가 섞인 배치는 항상 거부하는 저장소 (데이터 오류)"""
+
+    def __init__(self, poison_id: int):
+        self.poison_id = poison_id
+        self.calls = 0
+        self.saved: list[EmbeddingRecord] = []
+
+    async def upsert_many(self, records):
+        self.calls += 1
+        if any(r.report_id == self.poison_id for r in records):
+            raise ValueError("value too long for type character varying(500)")
+        self.saved.extend(records)
+
+
+class FakeConnection:
+    """실행한 SQL과 COPY 인자를 기록하는 가짜 asyncpg 연결"""
+
+    def __init__(self):
+        self.statements: list[str] = []
+        self.copies: list[dict] = []
+        self.codecs: dict[str, dict] = {}
+        self.in_transaction = False
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.in_transaction = True
+        try:
+            yield
+        finally:
+            self.in_transaction = False
+
+    async def execute(self, sql, *args):
+        assert self.in_transaction
+        self.statements.append(" ".join(sql.split()))
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        assert self.in_transaction
+        self.copies.append({"table": table, "records": list(records), "columns": columns})
+
+    async def set_type_codec(self, name, *, schema, encoder, decoder, format):
+        self.codecs[name] = {"schema": schema, "encoder": encoder, "decoder": decoder, "format": format}
+
+
+class FakePool:
+    def __init__(self, conn: FakeConnection, schema_ok: bool = True):
+        self.conn = conn
+        self.schema_ok = schema_ok
+
+    async def fetchval(self, sql, *args):
+        return self.schema_ok
+
+    @asynccontextmanager
+    async def acquire(self, timeout=None):
+        yield self.conn
+
+
+class FakeEmbeddingService:
+    """텍스트 길이로 벡터를 만드는 가짜 임베딩 서비스"""
+
+    def __init__(self, model: str, output_dimension: int = 2):
+        self.model = model
+        self.dimension = 2
+        self.output_dimension = output_dimension
+        self.calls = 0
+        self.texts = 0
+
+    async def embed_many(self, texts: list[str]) -> list[EmbeddingResult]:
+        self.calls += 1
+        self.texts += len(texts)
+        return [
+            EmbeddingResult(
+                vector=np.array(
+                    [float(len(text))] + [1.0] * (self.output_dimension - 1), dtype=np.float32
+                ),
+                model=self.model,
+                text_digest=text_digest(text),
+            )
+            for text in texts
+        ]
+
+
+async def _open_store() -> SQLiteVectorStore:
+    store = SQLiteVectorStore()
+    await store.open()
+    await store.register_model(MODEL, 2)
+    await store.activate_model(MODEL)
+    return store
+
+
+def test_flush_upserts_latest_record_per_report():
+    """같은 report_id는 한 행만 남고 마지막 값으로 갱신되어야 합니다"""
+
+    async def scenario():
+        store = await _open_store()
+        buffer = WriteBehindBuffer(store, batch_size=100, flush_interval=60)
+
+        await buffer.enqueue(_record(1, [0.1, 0.2], "first", digest="a"))
+        await buffer.enqueue(_record(2, [0.3, 0.4], "other", digest="b"))
+        await buffer.enqueue(_record(1, [0.5, 0.6], "second", digest="c"))
+        assert buffer.pending_count == 2
+
+        assert await buffer.flush() == 2
+        # 이미 저장된 report_id 재저장 → upsert
+        await buffer.enqueue(_record(2, [0.7, 0.8], "updated", digest="d"))
+        await buffer.flush()
+        return store, await store.count(MODEL)
+
+    store, count = asyncio.run(scenario())
+
+    assert count == 2
+    assert store.get(1, MODEL).report_title == "second"
+    assert store.get(2, MODEL).report_title == "updated"
+    assert abs(store.get(2, MODEL).embedding[0] - 0.7) < 1e-6
+
+
+def test_background_task_flushes_full_batch():
+    """batch_size에 도달하면 interval을 기다리지 않고 기록해야 합니다"""
+
+    async def scenario():
+        store = await _open_store()
+        buffer = WriteBehindBuffer(store, batch_size=3, flush_interval=60)
+        buffer.start()
+
+        for report_id in range(3):
+            await buffer.enqueue(_record(report_id, [1.0, 0.0]))
+        await asyncio.sleep(0.1)
+        count = await store.count(MODEL)
+
+        await buffer.close()
+        return count
+
+    assert asyncio.run(scenario()) == 3
+
+
+def test_failed_flush_is_retried():
+    """저장 실패 시 레코드를 잃지 않고 다음 flush에 다시 기록해야 합니다"""
+
+    async def scenario():
+        store = FailingStore()
+        buffer = WriteBehindBuffer(store, batch_size=100, flush_interval=60)
+        await buffer.enqueue(_record(1, [1.0]))
+
+        assert await buffer.flush() == 0
+        assert buffer.pending_count == 1
+        await buffer.close()
+        return store
+
+    store = asyncio.run(scenario())
+
+    assert [r.report_id for r in store.saved] == [1]
+
+
+def test_close_lets_inflight_flush_finish():
+    """종료 중에 진행 중인 flush를 취소하지 않고 끝까지 기록해야 합니다"""
+
+    async def scenario():
+        store = SlowStore(delay=0.2)
+        buffer = WriteBehindBuffer(store, batch_size=3, flush_interval=60)
+        buffer.start()
+
+        for report_id in range(3):
+            await buffer.enqueue(_record(report_id, [1.0, 0.0]))
+        await asyncio.sleep(0.05)  # 백그라운드 flush가 upsert를 기다리는 중
+        await buffer.enqueue(_record(3, [1.0, 0.0]))
+
+        await buffer.close()
+        return store, buffer
+
+    store, buffer = asyncio.run(scenario())
+
+    assert sorted(r.report_id for r in store.saved) == [0, 1, 2, 3]
+    assert buffer.pending_count == 0
+
+
+def test_full_buffer_rejects_new_records_without_blocking():
+    """저장소 장애로 대기열이 가득 차면 flush를 기다리지 않고 새 레코드를 거절해야 합니다"""
+
+    async def scenario():
+        buffer = WriteBehindBuffer(SlowStore(delay=10), batch_size=2, flush_interval=60, max_pending=3)
+        accepted = [
+            await asyncio.wait_for(buffer.enqueue(_record(report_id, [1.0])), timeout=1)
+            for report_id in range(5)
+        ]
+        # 이미 대기 중인 리포트의 갱신은 대기열이 가득 차도 받음
+        updated = await buffer.enqueue(_record(0, [2.0]))
+        return accepted, updated, buffer
+
+    accepted, updated, buffer = asyncio.run(scenario())
+
+    assert accepted == [True, True, True, False, False]
+    assert updated
+    assert buffer.pending_count == 3
+    assert buffer.rejected == 2
+
+
+def test_cancelled_flush_requeues_batch():
+    """flush가 취소되면 배치를 다시 대기열에 넣어야 합니다"""
+
+    async def scenario():
+        buffer = WriteBehindBuffer(SlowStore(delay=10), batch_size=100, flush_interval=60)
+        await buffer.enqueue(_record(1, [1.0]))
+
+        task = asyncio.create_task(buffer.flush())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return buffer.pending_count
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_poison_record_is_isolated_and_dead_lettered():
+    """데이터 오류를 내는 행만 골라내고, max_attempts번 실패하면 재시도를 멈춰야 합니다"""
+
+    async def scenario():
+        store = PoisonStore(poison_id=13)
+        buffer = WriteBehindBuffer(store, batch_size=100, flush_interval=60, max_attempts=2)
+        for report_id in range(20):
+            await buffer.enqueue(_record(report_id, [1.0]))
+
+        first = await buffer.flush()
+        pending_after_first = buffer.pending_count
+
+        await buffer.enqueue(_record(20, [1.0]))
+        second = await buffer.flush()
+        return store, buffer, first, pending_after_first, second
+
+    store, buffer, first, pending_after_first, second = asyncio.run(scenario())
+
+    assert first == 19
+    assert pending_after_first == 1
+    # 두 번째 실패에서 dead letter로 이동, 함께 들어온 새 레코드는 기록
+    assert second == 1
+    assert buffer.pending_count == 0
+    assert [r.report_id for r in buffer.dead_letters] == [13]
+    assert sorted(r.report_id for r in store.saved) == [i for i in range(21) if i != 13]
+
+
+def test_pgvector_codec_round_trip():
+    """pgvector 바이너리 형식: 차원, 예약 필드, big-endian float32"""
+    vector = np.array([0.25, -1.5, 3.0], dtype=np.float32)
+
+    data = _encode_pgvector(vector)
+    decoded = _decode_pgvector(data)
+
+    assert data[:4] == b"\x00\x03\x00\x00"
+    assert len(data) == 4 + 3 * 4
+    assert decoded.dtype == np.float32
+    assert np.array_equal(decoded, vector)
+    # float 목록도 같은 바이트로 인코딩
+    assert _encode_pgvector([0.25, -1.5, 3.0]) == data
+
+
+def test_postgres_upsert_copies_into_staging_then_merges():
+    """바이너리 COPY로 스테이징 테이블에 적재한 뒤 ON CONFLICT로 한 번에 upsert해야 합니다"""
+    conn = FakeConnection()
+    store = PostgresVectorStore("postgresql://test")
+    store._pool = FakePool(conn)
+    vector = np.array([0.1, 0.2], dtype=np.float32)
+
+    async def scenario():
+        await store._init_connection(conn)
+        await store.upsert_many([_record(1, vector, "title", digest="a"), _record(2, [0.3, 0.4])])
+        await store.upsert_many([])
+
+    asyncio.run(scenario())
+
+    codec = conn.codecs["vector"]
+    assert codec["format"] == "binary"
+    assert codec["encoder"] is _encode_pgvector
+
+    assert len(conn.statements) == 2
+    assert conn.statements[0].startswith("CREATE TEMP TABLE IF NOT EXISTS report_embeddings_staging")
+    assert "ON COMMIT DELETE ROWS" in conn.statements[0]
+    assert conn.statements[1].startswith("INSERT INTO report_embeddings")
+    assert "FROM report_embeddings_staging" in conn.statements[1]
+    assert "ON CONFLICT (report_id, model) DO UPDATE" in conn.statements[1]
+
+    (copy,) = conn.copies
+    assert copy["table"] == "report_embeddings_staging"
+    assert copy["columns"] == ["report_id", "model", "dimension", "text_digest", "report_title", "embedding"]
+    assert copy["records"][0][:5] == (1, MODEL, 2, "a", "title")
+    # 배열은 복사 없이 그대로 넘기고, 인코딩은 등록된 코덱이 담당
+    assert copy["records"][0][5] is vector
+    assert np.array_equal(codec["decoder"](codec["encoder"](copy["records"][1][5])), np.float32([0.3, 0.4]))
+
+
+def test_postgres_store_rejects_unmigrated_schema():
+    """UNIQUE (report_id, model)이 없는 기존 DB면 모든 upsert가 실패하므로 워밍업에서 막아야 합니다"""
+    store = PostgresVectorStore("postgresql://test")
+
+    store._pool = FakePool(FakeConnection(), schema_ok=False)
+    with pytest.raises(RuntimeError, match="001_embedding_model_versions.sql"):
+        asyncio.run(store._check_schema())
+
+    store._pool = FakePool(FakeConnection(), schema_ok=True)
+    asyncio.run(store._check_schema())
+
+
+def test_migration_reembeds_side_by_side_and_switches():
+    """새 모델 벡터가 기존 벡터 옆에 저장되고, 전환 후에만 live가 되어야 합니다"""
+    reports = [
+        (report_id, f"report {report_id}", {"overview": {"summary": "x" * report_id}})
+        for report_id in range(1, 6)
+    ]
+
+    async def scenario():
+        store = await _open_store()
+        await store.upsert_many([_record(report_id, [0.0, 1.0]) for report_id in range(1, 6)])
+
+        service = FakeEmbeddingService("text-embedding-3-large")
+        migration = EmbeddingMigration(store, service, batch_size=2)
+        await migration.start(reports)
+
+        assert await store.live_model() == MODEL
+        await migration.switch()
+
+        # 같은 텍스트로 다시 돌리면 다이제스트가 같아 재임베딩하지 않음
+        rerun = EmbeddingMigration(store, service, batch_size=2)
+        progress = await rerun.run(reports)
+        return store, service, progress
+
+    store, service, progress = asyncio.run(scenario())
+
+    assert asyncio.run(store.live_model()) == "text-embedding-3-large"
+    assert asyncio.run(store.count(MODEL)) == 5
+    assert asyncio.run(store.count("text-embedding-3-large")) == 5
+    # 차원 확인 1회 + 배치(2, 2, 1)당 1회, 재실행은 차원 확인만
+    assert service.calls == 5
+    assert service.texts == 7
+    assert progress.skipped == 5
+
+
+def test_migration_rejects_dimension_mismatch_before_writing():
+    """대상 모델 출력 차원이 저장 차원과 다르면 등록/저장 전에 거부해야 합니다"""
+
+    async def scenario():
+        store = await _open_store()
+        service = FakeEmbeddingService("text-embedding-3-large", output_dimension=3)
+        with pytest.raises(ValueError, match="차원"):
+            await EmbeddingMigration(store, service).run([(1, None, {"overview": {"summary": "x"}})])
+        return await store.count("text-embedding-3-large")
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_migration_counts_failed_batch_and_continues():
+    """한 배치의 저장이 실패해도 나머지 배치는 계속 처리되어야 합니다"""
+
+    class FlakyStore(SQLiteVectorStore):
+        async def upsert_many(self, records):
+            if any(record.report_id == 1 for record in records):
+                raise RuntimeError("boom")
+            return await super().upsert_many(records)
+
+    async def scenario():
+        store = FlakyStore()
+        await store.open()
+        service = FakeEmbeddingService("text-embedding-3-large")
+        reports = [(report_id, None, {"overview": {"summary": "x" * report_id}}) for report_id in range(1, 5)]
+        progress = await EmbeddingMigration(store, service, batch_size=2).run(reports)
+        return progress, await store.count("text-embedding-3-large")
+
+    progress, count = asyncio.run(scenario())
+
+    assert (progress.failed, progress.embedded, progress.processed) == (2, 2, 4)
+    assert count == 2
+
+
+def test_read_report_sources_from_ndjson():
+    data = (
+        b'{"report_id": 1, "report_title": "a", "report": {"overview": {"summary": "x"}}}\n'
+        b"\n"
+        b'{"report_id": 2, "report": {}}\n'
+    )
+
+    assert list(read_report_sources(data)) == [
+        (1, "a", {"overview": {"summary": "x"}}),
+        (2, None, {}),
+    ]
+
+
+def test_warm_up_embeds_with_live_model(tmp_path, monkeypatch):
+    """마이그레이션으로 live 모델이 바뀌었으면 EMBEDDING_MODEL 대신 live 모델로 임베딩해야 합니다"""
+    from app.main import warm_up
+
+    path = tmp_path / "vectors.db"
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("VECTOR_STORE_URL", f"sqlite:///{path}")
+    monkeypatch.setenv("EMBEDDING_MODEL", MODEL)
+    monkeypatch.setenv("CLUSTER_INDEX_ENABLED", "false")
+    get_settings.cache_clear()
+
+    async def scenario():
+        store = SQLiteVectorStore(str(path))
+        await store.open()
+        await store.register_model("text-embedding-3-large", 1536)
+        await store.activate_model("text-embedding-3-large")
+        await store.close()
+
+        app = SimpleNamespace(state=SimpleNamespace(readiness=Readiness(), write_behind=None))
+        await warm_up(app)
+        await app.state.write_behind.close()
+        return app.state.embedding_service.model
+
+    try:
+        assert asyncio.run(scenario()) == "text-embedding-3-large"
+    finally:
+        get_settings.cache_clear()
+
+
+def test_warm_up_retries_until_store_recovers(tmp_path, monkeypatch):
+    """저장소가 처음에 실패해도 재시도해 ready가 되고, 실패 중에는 마지막 오류를 표시해야 합니다"""
+    from app.main import warm_up
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("VECTOR_STORE_URL", f"sqlite:///{tmp_path / 'vectors.db'}")
+    monkeypatch.setenv("CLUSTER_INDEX_ENABLED", "false")
+    monkeypatch.setenv("WARM_UP_RETRY_INITIAL_DELAY", "0")
+    get_settings.cache_clear()
+
+    readiness = Readiness()
+    readiness.register("embedding_service")
+    readiness.register("vector_store")
+    errors = []
+    open_store = SQLiteVectorStore.open
+
+    async def flaky_open(self):
+        if len(errors) < 2:
+            errors.append(readiness.errors())
+            raise OSError("connection refused")
+        await open_store(self)
+
+    monkeypatch.setattr(SQLiteVectorStore, "open", flaky_open)
+
+    async def scenario():
+        app = SimpleNamespace(state=SimpleNamespace(readiness=readiness, write_behind=None))
+        await warm_up(app)
+        await app.state.write_behind.close()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        get_settings.cache_clear()
+
+    assert errors[1] == {"vector_store": "OSError: connection refused"}
+    assert readiness.is_ready
+    assert readiness.errors() == {}
+
+
+def test_create_vector_store_by_scheme():
+    assert isinstance(create_vector_store("sqlite://"), SQLiteVectorStore)
+    assert create_vector_store("sqlite:///reports.db").path == "reports.db"